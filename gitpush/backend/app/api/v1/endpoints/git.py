@@ -1,7 +1,9 @@
-from fastapi import APIRouter, BackgroundTasks
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from app.schemas.base import BaseResponse
 from app.schemas.git import (
-    GitPushRequest, GitPushResponse, GitStatusResponse, GitCancelResponse,
+    GitPushRequest, GitPushResponse, GitStatusResponse, GitCancelResponse, GitTaskLogResponse,
     ValidateRepoResponse, ValidateBranchResponse, GetBranchesResponse,
     CreateBranchRequest, CreateBranchResponse
 )
@@ -48,13 +50,40 @@ async def push_git(request: GitPushRequest):
 @router.get("/status/{task_id}", response_model=BaseResponse[GitStatusResponse])
 async def get_git_status(task_id: str):
     try:
-        result = GitService.get_status(task_id)
+        result = await GitService.load_status(task_id)
         return BaseResponse(data=result)
     except Exception as e:
         logger.error(f"获取 Git 任务状态失败: task_id={task_id}, 错误: {e}")
         raise
 
 
+@router.get("/tasks/{task_id}/logs", response_model=BaseResponse[GitTaskLogResponse])
+async def get_git_task_logs(task_id: str, offset: int = 0, limit: int = 200):
+    try:
+        result = GitService.get_logs(task_id, offset, limit)
+        return BaseResponse(data=result)
+    except Exception as e:
+        logger.error(f"获取 Git 任务日志失败: task_id={task_id}, 错误: {e}")
+        raise
+
+
+@router.get("/events/{task_id}")
+async def stream_git_events(task_id: str, request: Request, after: Optional[int] = None):
+    try:
+        last_event_id = request.headers.get("Last-Event-ID")
+        if after is None and last_event_id and last_event_id.isdigit():
+            after = int(last_event_id)
+        GitService.get_status(task_id)
+        return StreamingResponse(
+            GitService.stream_events(task_id, after),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except Exception as e:
+        logger.error(f"订阅 Git 任务事件失败: task_id={task_id}, 错误: {e}")
+        raise
+
+
 @router.post("/cancel/{task_id}", response_model=BaseResponse[GitCancelResponse])
 async def cancel_git(task_id: str):
     try:
@@ -65,6 +94,37 @@ async def cancel_git(task_id: str):
         raise
 
 
+@router.get("/metrics", response_model=BaseResponse[dict])
+async def get_git_metrics():
+    try:
+        result = GitService.get_performance_metrics()
+        return BaseResponse(data=result)
+    except Exception as e:
+        logger.error(f"获取 Git 任务指标失败: 错误: {e}")
+        raise
+
+
+@router.get("/workspaces", response_model=BaseResponse[dict])
+async def get_workspace_pool():
+    try:
+        result = GitService.get_workspace_pool_stats()
+        return BaseResponse(data=result)
+    except Exception as e:
+        logger.error(f"获取工作区池状态失败: 错误: {e}")
+        raise
+
+
+@router.post("/rate/limit", response_model=BaseResponse[dict])
+async def get_rate_limit(request: dict):
+    try:
+        token = request.get("token")
+        result = await GitService.get_rate_limit(token)
+        return BaseResponse(data=result)
+    except Exception as e:
+        logger.error(f"获取 GitHub 请求配额失败: 错误: {e}")
+        raise
+
+
 @router.post("/validate/repo", response_model=BaseResponse[ValidateRepoResponse])
 async def validate_repo(request: dict):
     try:
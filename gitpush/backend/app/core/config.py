@@ -3,6 +3,8 @@ from typing import List
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+DEFAULT_JWT_SECRET = "your-secret-key-change-in-production"
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -29,8 +31,13 @@ class Settings(BaseSettings):
     REPOS_DIR: Path = Field(default=Path.home() / ".gitpush" / "repos", description="仓库目录")
     
     DATABASE_URL: str = Field(default="sqlite:///./gitpush.db", description="数据库连接URL")
+    TASK_STORE_ENABLED: bool = Field(default=True, description="是否把推送任务持久化到数据库，重启后恢复未完成的任务")
+    TASK_STORE_FLUSH_INTERVAL: float = Field(default=0.5, description="任务状态批量写入数据库的间隔(秒)")
+    TASK_STORE_BATCH_SIZE: int = Field(default=200, description="积累多少个任务变化后立即写入")
+    TASK_STORE_RETENTION_DAYS: int = Field(default=7, description="已结束任务记录的保留天数")
+    TASK_STORE_PERSIST_TOKEN: bool = Field(default=False, description="是否保存未结束任务的 token(以 JWT_SECRET 派生的密钥加密)，用于重启后恢复排队中的任务；JWT_SECRET 为默认值时不生效")
     
-    JWT_SECRET: str = Field(default="your-secret-key-change-in-production", description="JWT密钥")
+    JWT_SECRET: str = Field(default=DEFAULT_JWT_SECRET, description="JWT密钥")
     JWT_ALGORITHM: str = Field(default="HS256", description="JWT算法")
     JWT_EXPIRE_MINUTES: int = Field(default=60 * 24 * 7, description="JWT过期时间(分钟)")
     
@@ -38,6 +45,39 @@ class Settings(BaseSettings):
     
     MAX_UPLOAD_SIZE: int = Field(default=10 * 1024 * 1024, description="最大上传大小(字节)")
     
+    GIT_MAX_CONCURRENT_TASKS: int = Field(default=4, description="Git 推送任务最大并发数")
+    TASK_LOG_MAX_LINES: int = Field(default=2000, description="单个任务在内存中保留的日志行数")
+    TASK_LOG_MAX_BYTES: int = Field(default=256 * 1024, description="单个任务在内存中保留的日志字节数")
+    TASK_LOG_SPILL: bool = Field(default=True, description="超出内存上限的任务日志是否写入磁盘")
+    TREE_WALK_WORKERS: int = Field(default=8, description="目录遍历并行线程数")
+    GIT_PUSH_ENGINE: str = Field(default="auto", description="默认提交引擎: workspace, index, fast-import, api, auto")
+    GIT_AUTO_FALLBACK_ENGINE: str = Field(default="workspace", description="auto 模式下负载超过阈值或 API 不可用时使用的引擎")
+    GIT_API_ENGINE_MAX_FILES: int = Field(default=300, description="auto 模式下使用 HTTP 引擎的最大文件数")
+    GIT_API_ENGINE_MAX_BYTES: int = Field(default=20 * 1024 * 1024, description="auto 模式下使用 HTTP 引擎的最大总字节数")
+    GIT_API_BLOB_CONCURRENCY: int = Field(default=8, description="HTTP 引擎并发上传 blob 的数量")
+    GITHUB_API_URL: str = Field(default="https://api.github.com", description="GitHub API 地址，可指向本地测试服务")
+    GITHUB_HTTP_POOL_SIZE: int = Field(default=100, description="GitHub API 连接池总连接数")
+    GITHUB_HTTP_PER_HOST: int = Field(default=20, description="GitHub API 每个主机的最大连接数")
+    GITHUB_HTTP_KEEPALIVE: float = Field(default=60.0, description="空闲连接保持时间(秒)")
+    GITHUB_DNS_CACHE_TTL: int = Field(default=300, description="DNS 解析缓存时间(秒)")
+    GITHUB_CACHE_TTL: float = Field(default=60.0, description="GitHub 元数据响应缓存的有效期(秒)，过期后用 ETag 重新验证")
+    GITHUB_CACHE_MAX_ENTRIES: int = Field(default=1024, description="GitHub 响应缓存的最大条目数，0 表示不缓存")
+    GITHUB_PAGE_CONCURRENCY: int = Field(default=4, description="分页接口并发获取的页数")
+    GITHUB_MAX_PAGES: int = Field(default=50, description="分页接口最多获取的页数")
+    GITHUB_RATE_PER_SECOND: float = Field(default=10.0, description="每个 token 默认的 GitHub 请求速率(次/秒)")
+    GITHUB_RATE_BURST: int = Field(default=20, description="每个 token 允许的突发请求数")
+    GITHUB_RATE_RESERVE: int = Field(default=50, description="剩余配额低于该值时暂停请求直到配额重置")
+    GITHUB_RATE_MAX_WAIT: float = Field(default=900.0, description="请求因限流排队的最长等待时间(秒)，超过后返回 429")
+    GITHUB_RATE_LIMIT_RETRIES: int = Field(default=3, description="收到限流响应后等待重发的最大次数")
+    REPO_METADATA_TTL: float = Field(default=60.0, description="默认分支和分支 SHA 的缓存时间(秒)")
+    GIT_LEAN_WORKSPACE: bool = Field(default=False, description="默认是否使用精简工作区（浅克隆、blob:none、稀疏检出）")
+    GIT_SHARED_OBJECT_CACHE: bool = Field(default=True, description="同一仓库的分支工作区是否通过 alternates 共享 REPOS_DIR 下的对象库")
+    GIT_COALESCE_PUSHES: bool = Field(default=False, description="默认是否把同一仓库分支的排队任务合并为一次提交推送")
+    GIT_COALESCE_MAX_BATCH: int = Field(default=50, description="单次合并执行的最大任务数")
+    WORKSPACE_DISK_QUOTA_MB: int = Field(default=20480, description="git_workspace 磁盘配额(MB)，0 表示不限制")
+    WORKSPACE_MIN_IDLE_SECONDS: int = Field(default=600, description="工作区最近一次使用后至少空闲多久才允许被淘汰(秒)")
+    FILE_COMPARE_MODE: str = Field(default="hash", description="覆盖时的文件比较方式: hash(与 HEAD 比较 blob 哈希), bytes(逐字节比较)")
+    
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field, field_validator
 from enum import Enum
 
@@ -10,6 +10,14 @@ class ConflictStrategy(str, Enum):
     RENAME = "rename"
 
 
+class PushEngine(str, Enum):
+    WORKSPACE = "workspace"
+    INDEX = "index"
+    FAST_IMPORT = "fast-import"
+    API = "api"
+    AUTO = "auto"
+
+
 class GitPushRequest(BaseModel):
     token: str = Field(..., description="GitHub Token")
     repo: str = Field(..., description="仓库格式: owner/repo")
@@ -21,6 +29,10 @@ class GitPushRequest(BaseModel):
     max_files: Optional[int] = Field(default=None, description="文件数量限制")
     max_single_file: Optional[int] = Field(default=None, description="单文件大小限制（字节）")
     force: bool = Field(default=False, description="是否强制推送")
+    allow_hardlink: bool = Field(default=False, description="源目录与工作区在同一文件系统时是否允许用硬链接代替复制")
+    lean_workspace: Optional[bool] = Field(default=None, description="是否使用精简工作区（depth=1、blob:none、稀疏检出），默认取配置 GIT_LEAN_WORKSPACE")
+    coalesce: Optional[bool] = Field(default=None, description="是否允许与同一仓库分支的排队任务合并为一次提交推送，默认取配置 GIT_COALESCE_PUSHES")
+    engine: Optional[PushEngine] = Field(default=None, description="提交引擎: workspace(复制到工作区), index(直接写入对象库和索引), fast-import(流式写入提交), api(通过 Git Data API 上传), auto(按负载大小选择 api 或 GIT_AUTO_FALLBACK_ENGINE)，默认取配置 GIT_PUSH_ENGINE")
     
     @field_validator("token")
     @classmethod
@@ -52,12 +64,26 @@ class GitPushResponse(BaseModel):
     message: str = Field(description="状态消息")
 
 
+class GitPushProgress(BaseModel):
+    phase: Optional[str] = Field(default=None, description="当前阶段，如 writing objects")
+    percent: Optional[int] = Field(default=None, description="当前阶段完成百分比")
+    objects_done: Optional[int] = Field(default=None, description="已处理对象数")
+    objects_total: Optional[int] = Field(default=None, description="对象总数")
+    bytes_sent: Optional[int] = Field(default=None, description="已发送字节数")
+    transfer_rate: Optional[int] = Field(default=None, description="传输速率（字节/秒）")
+    phase_done: bool = Field(default=False, description="当前阶段是否完成")
+    eta_seconds: Optional[float] = Field(default=None, description="当前阶段预计剩余时间（秒）")
+    stalled: bool = Field(default=False, description="进度是否长时间未更新")
+    updated_at: Optional[float] = Field(default=None, description="最近一次进度更新时间")
+
+
 class GitStatusResponse(BaseModel):
     task_id: str = Field(description="任务ID")
     status: str = Field(description="任务状态")
     pid: Optional[int] = Field(default=None, description="进程ID")
     progress: str = Field(description="进度信息")
-    output: str = Field(description="输出内容")
+    output: str = Field(description="输出内容（仅最近若干行，完整日志见 /git/tasks/{task_id}/logs）")
+    log_lines_total: Optional[int] = Field(default=0, description="日志总行数")
     error: Optional[str] = Field(default=None, description="错误信息")
     copied_files: Optional[int] = Field(default=0, description="已复制的文件数")
     skipped_files: Optional[int] = Field(default=0, description="已跳过的文件数")
@@ -66,6 +92,43 @@ class GitStatusResponse(BaseModel):
     total_size_bytes: Optional[int] = Field(default=0, description="总大小（字节）")
     total_files_count: Optional[int] = Field(default=0, description="总文件数")
     empty_dirs_count: Optional[int] = Field(default=0, description="空文件夹数")
+    pruned_dirs: Optional[int] = Field(default=0, description="遍历时剪枝跳过的忽略目录数")
+    ignored_files: Optional[int] = Field(default=0, description="遍历时被忽略的文件数")
+    unchanged_files: Optional[int] = Field(default=0, description="与上次快照相比未变化的源文件数")
+    changed_files: Optional[int] = Field(default=0, description="与上次快照相比已变化的源文件数")
+    new_files: Optional[int] = Field(default=0, description="上次快照中不存在的源文件数")
+    manifest_fast_skips: Optional[int] = Field(default=0, description="凭快照直接判定相同、未读取文件内容的文件数")
+    head_identical: Optional[int] = Field(default=0, description="与 HEAD 中 blob 哈希相同而跳过的文件数")
+    hashed_files: Optional[int] = Field(default=0, description="本次计算了 blob 哈希的源文件数")
+    engine: Optional[str] = Field(default=None, description="本次使用的提交引擎")
+    api_requests: Optional[int] = Field(default=None, description="HTTP 引擎发出的 API 请求数")
+    lean_workspace: Optional[bool] = Field(default=None, description="是否使用精简工作区")
+    shallow_fallback: Optional[bool] = Field(default=None, description="浅克隆推送被拒绝后是否回退到完整获取")
+    coalesced_into: Optional[str] = Field(default=None, description="合并执行时所在批次的首个任务 ID")
+    batch_size: Optional[int] = Field(default=None, description="合并执行的批次任务数")
+    copy_strategies: Optional[Dict[str, int]] = Field(default=None, description="各复制方式使用次数: reflink, copy_file_range, sendfile, hardlink, copy")
+    push_progress: Optional[GitPushProgress] = Field(default=None, description="结构化推送进度")
+    eta_seconds: Optional[float] = Field(default=None, description="推送预计剩余时间（秒）")
+    git_stats: Optional[dict] = Field(default=None, description="Git 命令执行统计（进程数、耗时）")
+    queue_position: Optional[int] = Field(default=None, description="排队位置（仅待执行任务）")
+    wait_time: Optional[float] = Field(default=0.0, description="排队等待时间（秒）")
+
+
+class GitTaskLogLine(BaseModel):
+    offset: int = Field(description="日志行序号")
+    stream: str = Field(description="输出流: stdout, stderr")
+    line: str = Field(description="日志内容")
+    timestamp: float = Field(description="记录时间")
+
+
+class GitTaskLogResponse(BaseModel):
+    task_id: str = Field(description="任务ID")
+    offset: int = Field(description="请求的起始行")
+    limit: int = Field(description="请求的行数")
+    total_lines: int = Field(description="日志总行数")
+    lines: List[GitTaskLogLine] = Field(description="日志行")
+    next_offset: int = Field(description="下一页起始行")
+    has_more: bool = Field(description="是否还有更多日志")
 
 
 class GitCancelResponse(BaseModel):
@@ -0,0 +1,144 @@
+import errno
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+from app.services.source_manifest import blob_hasher, HASH_CHUNK_SIZE
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FICLONE = 0x40049409
+
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    errno.EPERM,
+    errno.EMLINK,
+}
+
+
+class CopyStrategy:
+    REFLINK = "reflink"
+    COPY_FILE_RANGE = "copy_file_range"
+    SENDFILE = "sendfile"
+    HARDLINK = "hardlink"
+    COPY = "copy"
+
+
+class FileCopier:
+    """按 reflink -> copy_file_range -> sendfile -> 普通复制 的顺序尝试复制文件，
+    允许时优先使用硬链接。某种方式因文件系统不支持失败后，本实例内不再尝试。"""
+
+    ZERO_COPY_MIN_SIZE = 64 * 1024
+
+    def __init__(self, allow_hardlink: bool = False):
+        self.allow_hardlink = allow_hardlink
+        self.counts: Dict[str, int] = {}
+        self._disabled = set()
+        if fcntl is None:
+            self._disabled.add(CopyStrategy.REFLINK)
+        if not hasattr(os, "copy_file_range"):
+            self._disabled.add(CopyStrategy.COPY_FILE_RANGE)
+        if not hasattr(os, "sendfile"):
+            self._disabled.add(CopyStrategy.SENDFILE)
+
+    def _enabled(self, strategy: str) -> bool:
+        return strategy not in self._disabled
+
+    def _disable(self, strategy: str, error: OSError):
+        if error.errno in _UNSUPPORTED_ERRNOS:
+            logger.info(f"复制方式 {strategy} 不可用，后续回退: {error}")
+            self._disabled.add(strategy)
+
+    def _record(self, strategy: str):
+        self.counts[strategy] = self.counts.get(strategy, 0) + 1
+
+    @staticmethod
+    def _reflink(src_fd: int, dst_fd: int, size: int):
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+    @staticmethod
+    def _copy_file_range(src_fd: int, dst_fd: int, size: int):
+        offset = 0
+        while offset < size:
+            copied = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+            if copied == 0:
+                break
+            offset += copied
+
+    @staticmethod
+    def _sendfile(src_fd: int, dst_fd: int, size: int):
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+    @staticmethod
+    def _hashing_copy(fsrc, fdst, size: int) -> str:
+        hasher = blob_hasher(size)
+        while True:
+            chunk = fsrc.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            fdst.write(chunk)
+        return hasher.hexdigest()
+
+    def copy(self, src_file: Path, dest_path: Path, size: int) -> Optional[str]:
+        """复制 src_file 到 dest_path，返回内容的 git blob 哈希（零拷贝方式不读取内容，返回 None）。
+        目标已存在时先删除，避免写穿到与源文件共享 inode 的硬链接。"""
+        try:
+            os.unlink(dest_path)
+        except FileNotFoundError:
+            pass
+
+        if self.allow_hardlink and self._enabled(CopyStrategy.HARDLINK):
+            try:
+                os.link(src_file, dest_path)
+                self._record(CopyStrategy.HARDLINK)
+                return None
+            except OSError as e:
+                self._disable(CopyStrategy.HARDLINK, e)
+
+        content_hash = None
+        with open(src_file, "rb") as fsrc, open(dest_path, "wb") as fdst:
+            strategy = CopyStrategy.COPY
+            if size >= self.ZERO_COPY_MIN_SIZE:
+                for candidate, func in (
+                    (CopyStrategy.REFLINK, self._reflink),
+                    (CopyStrategy.COPY_FILE_RANGE, self._copy_file_range),
+                    (CopyStrategy.SENDFILE, self._sendfile),
+                ):
+                    if not self._enabled(candidate):
+                        continue
+                    try:
+                        func(fsrc.fileno(), fdst.fileno(), size)
+                        strategy = candidate
+                        break
+                    except OSError as e:
+                        self._disable(candidate, e)
+                        os.ftruncate(fdst.fileno(), 0)
+                        fdst.seek(0)
+                        fsrc.seek(0)
+
+            if strategy == CopyStrategy.COPY:
+                content_hash = self._hashing_copy(fsrc, fdst, size)
+
+        shutil.copystat(src_file, dest_path)
+        self._record(strategy)
+        return content_hash
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.counts)
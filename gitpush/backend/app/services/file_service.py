@@ -1,10 +1,10 @@
-import os
 import aiofiles
 from pathlib import Path
 from typing import Optional, List, Union
 from app.schemas.file import FileScanResponse
 from app.core.exceptions import AppException, ErrorCode
 from app.core.config import settings
+from app.services.tree_walker import TreeWalker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -94,17 +94,10 @@ class FileService:
                 error = None
                 
                 try:
-                    for root, dirs, files in os.walk(path):
-                        dir_count += len(dirs)
-                        file_count += len(files)
-                        
-                        for file in files:
-                            file_path = Path(root) / file
-                            try:
-                                total_size += file_path.stat().st_size
-                            except (PermissionError, OSError) as e:
-                                logger.warning(f"无法读取文件大小: {file_path}, 错误: {e}")
-                                continue
+                    walk = TreeWalker.walk(path)
+                    dir_count = walk.dir_count
+                    file_count = walk.file_count
+                    total_size = walk.total_size
                                 
                 except PermissionError as e:
                     logger.error(f"权限不足，无法扫描目录: {path}, 错误: {e}")
@@ -188,17 +181,10 @@ class FileService:
                     total_file_count += 1
                 elif path.is_dir():
                     try:
-                        for root, dirs, files in os.walk(path):
-                            total_dir_count += len(dirs)
-                            total_file_count += len(files)
-                            
-                            for file in files:
-                                file_path = Path(root) / file
-                                try:
-                                    total_size += file_path.stat().st_size
-                                except (PermissionError, OSError) as e:
-                                    logger.warning(f"无法读取文件大小: {file_path}, 错误: {e}")
-                                    continue
+                        walk = TreeWalker.walk(path)
+                        total_dir_count += walk.dir_count
+                        total_file_count += walk.file_count
+                        total_size += walk.total_size
                     except PermissionError as e:
                         logger.error(f"权限不足，无法扫描目录: {path}, 错误: {e}")
                         errors.append(f"权限不足: {path_str}")
@@ -0,0 +1,196 @@
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import logging
+from app.core.exceptions import AppException, ErrorCode
+
+logger = logging.getLogger(__name__)
+
+LineCallback = Callable[[str], None]
+
+_LINE_SPLIT = re.compile(rb"[\r\n]")
+
+
+class GitCommandStats:
+    def __init__(self):
+        self.spawn_count = 0
+        self.failed_count = 0
+        self.timeout_count = 0
+        self.canceled_count = 0
+        self.total_wall_time = 0.0
+        self.operations: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, wall_time: float, returncode: Optional[int], outcome: str = "exited"):
+        self.spawn_count += 1
+        self.total_wall_time += wall_time
+        if outcome == "timeout":
+            self.timeout_count += 1
+        elif outcome == "canceled":
+            self.canceled_count += 1
+        elif returncode != 0:
+            self.failed_count += 1
+
+        op_stats = self.operations.setdefault(operation, {"count": 0, "wall_time": 0.0, "max_wall_time": 0.0})
+        op_stats["count"] += 1
+        op_stats["wall_time"] += wall_time
+        op_stats["max_wall_time"] = max(op_stats["max_wall_time"], wall_time)
+
+    def get_summary(self) -> Dict[str, Any]:
+        return {
+            "spawn_count": self.spawn_count,
+            "failed_count": self.failed_count,
+            "timeout_count": self.timeout_count,
+            "canceled_count": self.canceled_count,
+            "total_wall_time": round(self.total_wall_time, 3),
+            "operations": {
+                name: {
+                    "count": int(op["count"]),
+                    "wall_time": round(op["wall_time"], 3),
+                    "max_wall_time": round(op["max_wall_time"], 3),
+                }
+                for name, op in self.operations.items()
+            },
+        }
+
+
+class GitRunner:
+    """基于 asyncio.create_subprocess_exec 的 Git 命令执行层，不占用线程池"""
+
+    global_stats = GitCommandStats()
+    terminate_grace_seconds = 5.0
+    read_chunk_size = 64 * 1024
+
+    @staticmethod
+    async def _pump(stream: asyncio.StreamReader, sink: Optional[bytearray], on_line: Optional[LineCallback]):
+        pending = b""
+        while True:
+            chunk = await stream.read(GitRunner.read_chunk_size)
+            if not chunk:
+                break
+            if sink is not None:
+                sink.extend(chunk)
+            if on_line is None:
+                continue
+
+            pending += chunk
+            parts = _LINE_SPLIT.split(pending)
+            pending = parts.pop()
+            for part in parts:
+                line = part.decode("utf-8", errors="ignore").strip()
+                if line:
+                    on_line(line)
+
+        if on_line is not None and pending:
+            line = pending.decode("utf-8", errors="ignore").strip()
+            if line:
+                on_line(line)
+
+    @staticmethod
+    async def _terminate(process: asyncio.subprocess.Process):
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), timeout=GitRunner.terminate_grace_seconds)
+        except asyncio.TimeoutError:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                return
+            await process.wait()
+
+    @staticmethod
+    async def run(
+        args: List[str],
+        cwd: str,
+        operation: str = "default",
+        timeout: Optional[float] = None,
+        capture_output: bool = True,
+        on_stdout: Optional[LineCallback] = None,
+        on_stderr: Optional[LineCallback] = None,
+        on_spawn: Optional[Callable[[asyncio.subprocess.Process], None]] = None,
+        stdin_data: Optional[bytes] = None,
+        env: Optional[Dict[str, str]] = None,
+        stats: Optional[GitCommandStats] = None,
+        stdin_stream: Optional[AsyncIterator[bytes]] = None
+    ) -> Tuple[int, bytes, bytes]:
+        """stdin_stream 用于边生成边写入的长输入（如 fast-import 数据流），与 stdin_data 二选一"""
+        want_stdout = capture_output or on_stdout is not None
+        want_stderr = capture_output or on_stderr is not None
+
+        start = time.monotonic()
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE if stdin_data is not None or stdin_stream is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if want_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE if want_stderr else asyncio.subprocess.DEVNULL,
+            env=env,
+        )
+        if on_spawn:
+            on_spawn(process)
+
+        stdout_buf = bytearray() if capture_output else None
+        stderr_buf = bytearray() if capture_output else None
+
+        async def feed():
+            try:
+                if stdin_stream is not None:
+                    async for chunk in stdin_stream:
+                        process.stdin.write(chunk)
+                        await process.stdin.drain()
+                else:
+                    process.stdin.write(stdin_data)
+                    await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                # 进程提前退出：停止写入，由 stderr 和返回码说明原因
+                logger.warning(f"Git 进程已关闭标准输入，停止写入: operation={operation}, pid={process.pid}, 错误: {e!r}")
+            finally:
+                if stdin_stream is not None and hasattr(stdin_stream, "aclose"):
+                    await stdin_stream.aclose()
+                process.stdin.close()
+
+        async def communicate():
+            pumps = []
+            if process.stdout is not None:
+                pumps.append(GitRunner._pump(process.stdout, stdout_buf, on_stdout))
+            if process.stderr is not None:
+                pumps.append(GitRunner._pump(process.stderr, stderr_buf, on_stderr))
+            if process.stdin is not None:
+                pumps.append(feed())
+            await asyncio.gather(*pumps)
+            return await process.wait()
+
+        outcome = "exited"
+        returncode: Optional[int] = None
+        try:
+            returncode = await asyncio.wait_for(communicate(), timeout=timeout)
+            return returncode, bytes(stdout_buf or b""), bytes(stderr_buf or b"")
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.error(f"Git 命令超时 ({timeout}s): operation={operation}, pid={process.pid}")
+            await GitRunner._terminate(process)
+            raise AppException(
+                code=ErrorCode.TIMEOUT_ERROR,
+                message=f"Git {operation} 操作超时 ({timeout}s)",
+                http_status=504,
+            )
+        except asyncio.CancelledError:
+            outcome = "canceled"
+            logger.info(f"Git 命令被取消，终止进程: operation={operation}, pid={process.pid}")
+            await asyncio.shield(GitRunner._terminate(process))
+            raise
+        except Exception as e:
+            outcome = "failed"
+            logger.error(f"Git 命令执行异常，终止进程: operation={operation}, pid={process.pid}, 错误: {e}")
+            await GitRunner._terminate(process)
+            raise
+        finally:
+            wall_time = time.monotonic() - start
+            GitRunner.global_stats.record(operation, wall_time, returncode, outcome)
+            if stats is not None:
+                stats.record(operation, wall_time, returncode, outcome)
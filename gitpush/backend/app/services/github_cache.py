@@ -0,0 +1,116 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    data: Any = None
+    reason: str = ""
+    text: str = ""
+    from_cache: bool = False
+    link: Optional[str] = None
+
+
+class CacheEntry:
+    __slots__ = ("etag", "last_modified", "data", "link", "stored_at")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], data: Any, link: Optional[str] = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.data = data
+        self.link = link
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """按 (token 哈希, URL) 缓存 GitHub GET 响应及其 ETag / Last-Modified。
+    TTL 内直接返回缓存；过期后带 If-None-Match / If-Modified-Since 重新验证，304 不消耗速率配额。"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+
+        self.lookups = 0
+        self.fresh_hits = 0
+        self.not_modified = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def token_hash(token: str) -> str:
+        return hashlib.sha1(token.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def make_key(cls, token: str, url: str) -> CacheKey:
+        return cls.token_hash(token), url
+
+    def lookup(self, key: CacheKey) -> Tuple[Optional[CacheEntry], bool]:
+        """返回 (缓存项, 是否仍在 TTL 内)"""
+        self.lookups += 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        self._entries.move_to_end(key)
+        fresh = time.monotonic() - entry.stored_at < self.ttl
+        if fresh:
+            self.fresh_hits += 1
+        return entry, fresh
+
+    def store(self, key: CacheKey, etag: Optional[str], last_modified: Optional[str], data: Any, link: Optional[str] = None):
+        self.misses += 1
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = CacheEntry(etag, last_modified, data, link)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def revalidated(self, key: CacheKey):
+        """服务端返回 304：内容未变，重新计时"""
+        self.not_modified += 1
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stored_at = time.monotonic()
+
+    def discard(self, key: CacheKey):
+        self._entries.pop(key, None)
+
+    def invalidate(self, token: Optional[str] = None, url_prefix: Optional[str] = None) -> int:
+        """删除匹配的缓存项；token 为 None 表示所有 token，url_prefix 为 None 表示所有 URL"""
+        digest = self.token_hash(token) if token is not None else None
+        keys = [
+            key for key in self._entries
+            if (digest is None or key[0] == digest) and (url_prefix is None or key[1].startswith(url_prefix))
+        ]
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.fresh_hits + self.not_modified
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "lookups": self.lookups,
+            "fresh_hits": self.fresh_hits,
+            "not_modified": self.not_modified,
+            "misses": self.misses,
+            "hit_ratio": round(hits / self.lookups, 3) if self.lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,264 @@
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+import logging
+import aiohttp
+from app.core.config import settings
+from app.services.github_cache import CacheEntry, CacheKey, CachedResponse, ResponseCache
+from app.services.rate_governor import RateGovernor
+
+logger = logging.getLogger(__name__)
+
+PER_PAGE = 100
+LAST_PAGE_PATTERN = re.compile(r'<([^>]+)>;\s*rel="last"')
+
+
+class GitHubClient:
+    """应用级共享的 GitHub HTTP 客户端：连接池、keep-alive 和 DNS 缓存在所有 API 调用间复用。
+    在 FastAPI lifespan 中创建和关闭；未启动时首次使用会按需创建。"""
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.cache = ResponseCache(settings.GITHUB_CACHE_TTL, settings.GITHUB_CACHE_MAX_ENTRIES)
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self.governor = RateGovernor(
+            settings.GITHUB_RATE_BURST,
+            settings.GITHUB_RATE_PER_SECOND,
+            settings.GITHUB_RATE_RESERVE,
+            settings.GITHUB_RATE_MAX_WAIT,
+        )
+
+        self.total_requests = 0
+        self.total_errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.sessions_created = 0
+        self.total_pages = 0
+        self.single_flight_joins = 0
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.total_requests += 1
+
+        async def on_request_exception(session, context, params):
+            self.total_errors += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            self.dns_cache_misses += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.GITHUB_HTTP_POOL_SIZE,
+            limit_per_host=settings.GITHUB_HTTP_PER_HOST,
+            ttl_dns_cache=settings.GITHUB_DNS_CACHE_TTL,
+            keepalive_timeout=settings.GITHUB_HTTP_KEEPALIVE,
+        )
+        self.sessions_created += 1
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            trace_configs=[self._build_trace_config()],
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """当前事件循环上的共享会话；会话已关闭或属于其他事件循环时重新创建"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = self._create_session()
+            self._loop = loop
+        return self._session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, token: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """经过速率控制的请求：发出前按 token 排队，被主/次级限流时等待后重发，最多 GITHUB_RATE_LIMIT_RETRIES 次"""
+        attempt = 0
+        while True:
+            await self.governor.acquire(token)
+            response = await self.session.request(method, url, **kwargs)
+            try:
+                body = await response.text() if response.status in (403, 429) else ""
+                delay = self.governor.observe(token, response.status, response.headers, body)
+            except BaseException:
+                response.release()
+                raise
+            if delay is None or attempt >= settings.GITHUB_RATE_LIMIT_RETRIES:
+                break
+            response.release()
+            attempt += 1
+            logger.warning(f"GitHub 请求被限流，{delay:.0f} 秒后重试 ({attempt}/{settings.GITHUB_RATE_LIMIT_RETRIES}): {method} {url}")
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def get_json(self, url: str, headers: Dict[str, str], token: str) -> CachedResponse:
+        """带条件请求缓存的 GET：TTL 内直接返回缓存，过期后用 ETag / Last-Modified 重新验证。
+        同一 token 对同一 URL 的并发请求只发出一次，其余调用等待并共享结果。"""
+        key = self.cache.make_key(token, url)
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            return CachedResponse(200, entry.data, from_cache=True, link=entry.link)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.single_flight_joins += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch_json(key, url, headers, token, entry)
+        except BaseException as e:
+            future.set_exception(
+                aiohttp.ClientError(f"共享请求已取消: {url}") if isinstance(e, asyncio.CancelledError) else e
+            )
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_json(
+        self,
+        key: CacheKey,
+        url: str,
+        headers: Dict[str, str],
+        token: str,
+        entry: Optional[CacheEntry]
+    ) -> CachedResponse:
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        async with self.request("GET", url, token, headers=request_headers) as response:
+            if response.status == 304 and entry is not None:
+                self.cache.revalidated(key)
+                return CachedResponse(200, entry.data, from_cache=True, link=entry.link)
+            if response.status == 200:
+                data = await response.json()
+                link = response.headers.get("Link")
+                self.cache.store(key, response.headers.get("ETag"), response.headers.get("Last-Modified"), data, link)
+                return CachedResponse(200, data, link=link)
+            if entry is not None:
+                self.cache.discard(key)
+            return CachedResponse(response.status, None, response.reason or "", await response.text())
+
+    @staticmethod
+    def _page_url(url: str, page: int) -> str:
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}per_page={PER_PAGE}&page={page}"
+
+    @staticmethod
+    def _last_page(link: Optional[str]) -> int:
+        """从 Link 头的 rel="last" 中读取总页数；没有分页时为 1"""
+        if not link:
+            return 1
+        match = LAST_PAGE_PATTERN.search(link)
+        if not match:
+            return 1
+        try:
+            return int(parse_qs(urlsplit(match.group(1)).query).get("page", ["1"])[0])
+        except ValueError:
+            return 1
+
+    async def get_paginated(self, url: str, headers: Dict[str, str], token: str) -> CachedResponse:
+        """获取列表接口的全部分页：先取第一页得到总页数，其余页面并发获取，每页单独进入缓存"""
+        first = await self.get_json(self._page_url(url, 1), headers, token)
+        if first.status != 200:
+            return first
+        last_page = self._last_page(first.link)
+        if last_page > settings.GITHUB_MAX_PAGES:
+            logger.warning(f"分页数 {last_page} 超过上限 {settings.GITHUB_MAX_PAGES}，只获取前 {settings.GITHUB_MAX_PAGES} 页: {url}")
+            last_page = settings.GITHUB_MAX_PAGES
+        self.total_pages += 1
+        if last_page <= 1:
+            return CachedResponse(200, list(first.data), from_cache=first.from_cache)
+
+        semaphore = asyncio.Semaphore(max(1, settings.GITHUB_PAGE_CONCURRENCY))
+
+        async def fetch_page(page: int) -> CachedResponse:
+            async with semaphore:
+                response = await self.get_json(self._page_url(url, page), headers, token)
+                self.total_pages += 1
+                return response
+
+        pages = await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1)))
+        items: List[Any] = list(first.data)
+        from_cache = first.from_cache
+        for response in pages:
+            if response.status != 200:
+                return response
+            items.extend(response.data)
+            from_cache = from_cache and response.from_cache
+        return CachedResponse(200, items, from_cache=from_cache)
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+            self._loop = asyncio.get_running_loop()
+        logger.info(
+            f"GitHub HTTP 客户端已启动: limit={settings.GITHUB_HTTP_POOL_SIZE}, "
+            f"limit_per_host={settings.GITHUB_HTTP_PER_HOST}, base={settings.GITHUB_API_URL}"
+        )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("GitHub HTTP 客户端已关闭")
+        self._session = None
+        self._loop = None
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        opened = self.connections_created + self.connections_reused
+        return {
+            "active": connector is not None,
+            "limit": settings.GITHUB_HTTP_POOL_SIZE,
+            "limit_per_host": settings.GITHUB_HTTP_PER_HOST,
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / opened, 3) if opened else 0.0,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "sessions_created": self.sessions_created,
+            "pages_fetched": self.total_pages,
+            "single_flight_joins": self.single_flight_joins,
+            "cache": self.cache.get_stats(),
+            "rate_limit": self.governor.get_stats(),
+        }
+
+
+github_client = GitHubClient()
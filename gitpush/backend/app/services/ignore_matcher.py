@@ -0,0 +1,250 @@
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _translate_glob(pattern: str) -> str:
+    res = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                j = i + 2
+                at_segment_start = i == 0 or pattern[i - 1] == "/"
+                at_segment_end = j == n or pattern[j] == "/"
+                if at_segment_start and at_segment_end:
+                    if j == n:
+                        res.append(".*")
+                        i = j
+                    else:
+                        res.append("(?:.*/)?")
+                        i = j + 1
+                    continue
+                res.append("[^/]*")
+                i = j
+                continue
+            res.append("[^/]*")
+        elif c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                res.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                res.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        else:
+            res.append(re.escape(c))
+        i += 1
+    return "".join(res)
+
+
+_GLOB_CHARS = set("*?[\\")
+
+
+def compile_pattern(line: str) -> Optional[Tuple[str, bool, bool, bool, str]]:
+    """把一行 gitignore 规则转换为 (正则, 是否取反, 是否仅匹配目录, 是否锚定路径, 原始模式)；空行和注释返回 None。
+    未锚定的规则（不含 /）只匹配路径的最后一段。"""
+    if not line or line.startswith("#"):
+        return None
+
+    pattern = line.rstrip("\n\r")
+    while pattern.endswith(" ") and not pattern.endswith("\\ "):
+        pattern = pattern[:-1]
+    if not pattern:
+        return None
+
+    negated = False
+    if pattern.startswith("!"):
+        negated = True
+        pattern = pattern[1:]
+    elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    return _translate_glob(pattern), negated, dir_only, anchored, pattern
+
+
+class _RuleSet:
+    """同一层内的规则集合：字面文件名和 *后缀 规则走哈希查找，其余规则合并为一个正则"""
+
+    def __init__(self, rules: List[Tuple[int, Tuple[str, bool, bool, bool, str]]]):
+        self.negated: Dict[int, bool] = {}
+        self.names: Dict[str, int] = {}
+        self.suffixes: Dict[str, int] = {}
+        self.suffix_lengths: List[int] = []
+        name_rules = []
+        path_rules = []
+
+        for index, (regex, negated, _, anchored, raw) in rules:
+            self.negated[index] = negated
+            if anchored:
+                path_rules.append((index, regex))
+            elif not _GLOB_CHARS.intersection(raw):
+                self.names[raw] = index
+            elif raw.startswith("*") and not _GLOB_CHARS.intersection(raw[1:]) and raw[1:]:
+                self.suffixes[raw[1:]] = index
+            else:
+                name_rules.append((index, regex))
+
+        self.suffix_lengths = sorted({len(suffix) for suffix in self.suffixes})
+        self.name_regex, self.name_index = self._combine(name_rules)
+        self.path_regex, self.path_index = self._combine(path_rules)
+
+    @staticmethod
+    def _combine(rules: List[Tuple[int, str]]) -> Tuple[Optional[Pattern], List[int]]:
+        if not rules:
+            return None, []
+        ordered = list(reversed(rules))
+        regex = re.compile("|".join(f"({rule[1]})" for rule in ordered), re.DOTALL)
+        return regex, [rule[0] for rule in ordered]
+
+    def match(self, local: str) -> Optional[bool]:
+        name = local.rpartition("/")[2]
+        best = self.names.get(name, -1)
+
+        for length in self.suffix_lengths:
+            if length <= len(name):
+                index = self.suffixes.get(name[-length:], -1)
+                if index > best:
+                    best = index
+
+        if self.name_regex is not None:
+            m = self.name_regex.fullmatch(name)
+            if m and self.name_index[m.lastindex - 1] > best:
+                best = self.name_index[m.lastindex - 1]
+
+        if self.path_regex is not None:
+            m = self.path_regex.fullmatch(local)
+            if m and self.path_index[m.lastindex - 1] > best:
+                best = self.path_index[m.lastindex - 1]
+
+        if best < 0:
+            return None
+        return not self.negated[best]
+
+
+class _PatternLayer:
+    def __init__(self, patterns: Iterable[str], base: str = "", prefix: str = ""):
+        self.base = base.strip("/")
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+        compiled = [rule for rule in (compile_pattern(p) for p in patterns) if rule]
+        self.size = len(compiled)
+        indexed = list(enumerate(compiled))
+        self.file_rules = _RuleSet([(index, rule) for index, rule in indexed if not rule[2]])
+        self.dir_rules = _RuleSet(indexed)
+
+    def local_path(self, rel: str) -> Optional[str]:
+        if self.base:
+            if not rel.startswith(self.base + "/"):
+                return None
+            rel = rel[len(self.base) + 1:]
+        return self.prefix + rel
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        local = self.local_path(rel)
+        if local is None:
+            return None
+        return (self.dir_rules if is_dir else self.file_rules).match(local)
+
+
+class IgnoreMatcher:
+    """预编译的 gitignore 匹配器：支持取反、锚定、仅目录规则，并缓存目录判定结果"""
+
+    def __init__(self):
+        self._layers: List[_PatternLayer] = []
+        self._dir_cache: Dict[str, bool] = {}
+
+    @property
+    def pattern_count(self) -> int:
+        return sum(layer.size for layer in self._layers)
+
+    def add_patterns(self, patterns: Iterable[str], base: str = "", prefix: str = ""):
+        """追加一层规则，后添加的层优先级更高。
+        base: 规则所在目录（相对于扫描根目录），prefix: 扫描根目录相对于规则所在目录的路径"""
+        layer = _PatternLayer(patterns, base=base, prefix=prefix)
+        if layer.size:
+            self._layers.append(layer)
+            self._dir_cache.clear()
+
+    def add_gitignore_file(self, gitignore: Path, base: str = "", prefix: str = ""):
+        try:
+            lines = gitignore.read_text(encoding="utf-8").splitlines()
+        except Exception as e:
+            logger.warning(f"读取 .gitignore 失败 {gitignore}: {e}")
+            return
+        self.add_patterns(lines, base=base, prefix=prefix)
+
+    def _match(self, rel: str, is_dir: bool) -> bool:
+        for layer in reversed(self._layers):
+            result = layer.match(rel, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def is_dir_ignored(self, rel_dir: str) -> bool:
+        cached = self._dir_cache.get(rel_dir)
+        if cached is not None:
+            return cached
+
+        parent, _, _ = rel_dir.rpartition("/")
+        result = (bool(parent) and self.is_dir_ignored(parent)) or self._match(rel_dir, True)
+        self._dir_cache[rel_dir] = result
+        return result
+
+    def is_ignored(self, rel_path, is_dir: bool = False) -> bool:
+        rel = rel_path.as_posix() if isinstance(rel_path, Path) else rel_path
+        if not rel or rel == ".":
+            return False
+        if is_dir:
+            return self.is_dir_ignored(rel)
+
+        parent, _, _ = rel.rpartition("/")
+        if parent and self.is_dir_ignored(parent):
+            return True
+        return self._match(rel, False)
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str]) -> "IgnoreMatcher":
+        matcher = cls()
+        matcher.add_patterns(patterns)
+        return matcher
+
+    @classmethod
+    def for_root(cls, root: Path, default_patterns: Iterable[str], extra_patterns: Iterable[str]) -> "IgnoreMatcher":
+        """默认规则 < 上级目录 .gitignore（由外到内） < 根目录 .gitignore < 请求指定的规则"""
+        matcher = cls()
+        matcher.add_patterns(default_patterns)
+
+        for base in reversed([root] + list(root.parents)):
+            gitignore = base / ".gitignore"
+            if gitignore.is_file():
+                prefix = root.relative_to(base).as_posix() if base != root else ""
+                matcher.add_gitignore_file(gitignore, prefix=prefix)
+
+        matcher.add_patterns(extra_patterns)
+        return matcher
@@ -0,0 +1,109 @@
+import re
+import time
+from typing import Optional, Dict, Any
+
+_PROGRESS_RE = re.compile(
+    r"^(?:remote:\s*)?(?P<phase>Enumerating|Counting|Compressing|Writing|Receiving|Resolving)\s+(?P<kind>objects|deltas):\s+"
+    r"(?:(?P<percent>\d{1,3})%\s+\((?P<done>\d+)/(?P<total>\d+)\)|(?P<count>\d+))"
+    r"(?:,\s*(?P<size>[\d.]+)\s*(?P<size_unit>bytes|[KMGT]iB))?"
+    r"(?:\s*\|\s*(?P<rate>[\d.]+)\s*(?P<rate_unit>bytes|[KMGT]iB)/s)?"
+    r"(?P<finished>,\s*done\.?)?"
+)
+
+_UNIT_FACTORS = {
+    "bytes": 1,
+    "KiB": 1024,
+    "MiB": 1024 ** 2,
+    "GiB": 1024 ** 3,
+    "TiB": 1024 ** 4,
+}
+
+STALL_THRESHOLD_SECONDS = 30.0
+
+
+def _to_bytes(value: Optional[str], unit: Optional[str]) -> Optional[int]:
+    if value is None or unit is None:
+        return None
+    return int(float(value) * _UNIT_FACTORS.get(unit, 1))
+
+
+class PushProgress:
+    def __init__(self):
+        self.phase: Optional[str] = None
+        self.percent: Optional[int] = None
+        self.objects_done: Optional[int] = None
+        self.objects_total: Optional[int] = None
+        self.bytes_sent: Optional[int] = None
+        self.transfer_rate: Optional[int] = None
+        self.phase_done = False
+        self.phase_started_at: Optional[float] = None
+        self.updated_at: Optional[float] = None
+
+    def feed(self, line: str) -> bool:
+        match = _PROGRESS_RE.match(line.strip())
+        if not match:
+            return False
+
+        now = time.time()
+        phase = f"{match.group('phase')} {match.group('kind')}".lower()
+        if phase != self.phase:
+            self.phase = phase
+            self.phase_started_at = now
+            self.bytes_sent = None
+            self.transfer_rate = None
+
+        if match.group("percent") is not None:
+            self.percent = int(match.group("percent"))
+            self.objects_done = int(match.group("done"))
+            self.objects_total = int(match.group("total"))
+        else:
+            self.objects_done = int(match.group("count"))
+            self.objects_total = None
+            self.percent = 100 if match.group("finished") else None
+
+        size = _to_bytes(match.group("size"), match.group("size_unit"))
+        if size is not None:
+            self.bytes_sent = size
+        rate = _to_bytes(match.group("rate"), match.group("rate_unit"))
+        if rate is not None:
+            self.transfer_rate = rate
+
+        self.phase_done = bool(match.group("finished"))
+        self.updated_at = now
+        return True
+
+    def estimate_eta(self, now: Optional[float] = None) -> Optional[float]:
+        if self.phase is None or self.phase_done:
+            return 0.0 if self.phase_done else None
+        if self.objects_total and self.objects_done is not None and self.objects_done >= self.objects_total:
+            return 0.0
+
+        if self.transfer_rate and self.bytes_sent and self.objects_done and self.objects_total:
+            bytes_per_object = self.bytes_sent / self.objects_done
+            remaining_bytes = (self.objects_total - self.objects_done) * bytes_per_object
+            return round(remaining_bytes / self.transfer_rate, 1)
+
+        if self.percent and self.phase_started_at:
+            elapsed = (now or time.time()) - self.phase_started_at
+            return round(elapsed * (100 - self.percent) / self.percent, 1)
+        return None
+
+    def is_stalled(self, now: Optional[float] = None) -> bool:
+        if self.updated_at is None or self.phase_done:
+            return False
+        return (now or time.time()) - self.updated_at > STALL_THRESHOLD_SECONDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "phase": self.phase,
+            "percent": self.percent,
+            "objects_done": self.objects_done,
+            "objects_total": self.objects_total,
+            "bytes_sent": self.bytes_sent,
+            "transfer_rate": self.transfer_rate,
+            "phase_done": self.phase_done,
+            "eta_seconds": self.estimate_eta(now),
+            "stalled": self.is_stalled(now),
+            "updated_at": self.updated_at,
+        }
@@ -0,0 +1,217 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+import logging
+from multidict import CIMultiDictProxy
+from app.core.exceptions import AppException, ErrorCode
+from app.services.github_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+SECONDARY_LIMIT_MARKERS = ("secondary rate limit", "abuse detection")
+SECONDARY_LIMIT_BACKOFF = 60.0
+
+
+def _header_number(headers: CIMultiDictProxy, name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class TokenBudget:
+    """单个 token 的速率配额：响应头中的剩余次数和重置时间，以及按剩余配额匀速放行的令牌桶"""
+
+    PACING_THRESHOLD = 0.2
+
+    def __init__(self, burst: int, default_rate: float):
+        self.burst = burst
+        self.default_rate = default_rate
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.resource: Optional[str] = None
+        self.blocked_until = 0.0
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+        self.requests = 0
+        self.waiting = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+
+    @property
+    def refill_rate(self) -> float:
+        """每秒放行的请求数：配额充足时按默认速率，剩余不足 PACING_THRESHOLD 后把剩余配额平摊到重置前的时间里"""
+        now = time.time()
+        if self.remaining is None or self.limit is None or self.reset_at <= now:
+            return self.default_rate
+        if self.remaining > self.limit * self.PACING_THRESHOLD:
+            return self.default_rate
+        return min(self.default_rate, max(self.remaining, 1) / max(self.reset_at - now, 1.0))
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(float(self.burst), self.tokens + (now - self.refilled_at) * self.refill_rate)
+        self.refilled_at = now
+        if self.reset_at and time.time() >= self.reset_at and self.limit is not None:
+            self.remaining = self.limit
+            self.reset_at = 0.0
+
+    def next_delay(self, reserve: int) -> float:
+        now = time.time()
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        self._refill()
+        if self.remaining is not None and self.remaining <= reserve and self.reset_at > now:
+            return self.reset_at - now + 1.0
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.refill_rate
+
+    def consume(self):
+        self.tokens -= 1.0
+        self.requests += 1
+        if self.remaining is not None:
+            self.remaining = max(0, self.remaining - 1)
+
+    def update(self, headers: CIMultiDictProxy):
+        limit = _header_number(headers, "X-RateLimit-Limit")
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        reset = _header_number(headers, "X-RateLimit-Reset")
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = reset
+        self.resource = headers.get("X-RateLimit-Resource", self.resource)
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "resource": self.resource,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at or None,
+            "reset_in": round(max(self.reset_at - now, 0.0), 1) if self.reset_at else None,
+            "blocked_for": round(max(self.blocked_until - now, 0.0), 1),
+            "refill_rate": round(self.refill_rate, 3),
+            "tokens": round(min(self.tokens, float(self.burst)), 2),
+            "requests": self.requests,
+            "waiting": self.waiting,
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 1),
+            "rate_limited": self.rate_limited,
+        }
+
+
+class RateGovernor:
+    """按 token 管理 GitHub 请求速率：请求前按令牌桶排队等待，响应后根据
+    X-RateLimit-* 和 Retry-After 更新配额；主/次级限流时暂停该 token 的请求而不是直接失败。"""
+
+    def __init__(self, burst: int, default_rate: float, reserve: int, max_wait: float):
+        self.burst = burst
+        self.default_rate = default_rate
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._budgets: Dict[str, TokenBudget] = {}
+
+    def _budget(self, token: str) -> TokenBudget:
+        key = ResponseCache.token_hash(token)
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = TokenBudget(self.burst, self.default_rate)
+            self._budgets[key] = budget
+        return budget
+
+    def _exhausted(self, budget: TokenBudget, message: str) -> AppException:
+        return AppException(
+            code=ErrorCode.RATE_LIMIT_ERROR,
+            message=message,
+            http_status=429,
+            details=budget.to_dict()
+        )
+
+    async def acquire(self, token: str):
+        """按到达顺序排队，直到该 token 可以发出下一个请求；
+        从进入排队开始计时，排队和限流等待的总时间超过上限时抛出 429"""
+        budget = self._budget(token)
+        started = time.monotonic()
+        budget.waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(budget.lock.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                raise self._exhausted(budget, f"GitHub 请求排队等待超过上限 {self.max_wait:.0f} 秒")
+            try:
+                while True:
+                    delay = budget.next_delay(self.reserve)
+                    if delay <= 0:
+                        budget.consume()
+                        break
+                    waited = time.monotonic() - started
+                    if waited + delay > self.max_wait:
+                        raise self._exhausted(
+                            budget,
+                            f"GitHub 请求配额不足，已等待 {waited:.1f} 秒，还需等待 {delay:.1f} 秒，超过上限 {self.max_wait:.0f} 秒"
+                        )
+                    if delay >= 1.0:
+                        logger.info(f"GitHub 请求限流等待 {delay:.1f} 秒: remaining={budget.remaining}")
+                    budget.throttled += 1
+                    budget.throttled_seconds += delay
+                    await asyncio.sleep(delay)
+            finally:
+                budget.lock.release()
+        finally:
+            budget.waiting -= 1
+
+    def observe(self, token: str, status: int, headers: CIMultiDictProxy, body: str = "") -> Optional[float]:
+        """记录响应中的配额信息；被限流时返回需要等待的秒数，否则返回 None"""
+        budget = self._budget(token)
+        budget.update(headers)
+        if status not in (403, 429):
+            return None
+
+        now = time.time()
+        retry_after = _header_number(headers, "Retry-After")
+        if retry_after is not None:
+            delay = retry_after
+        elif budget.remaining == 0 and budget.reset_at > now:
+            delay = budget.reset_at - now + 1.0
+        elif any(marker in body.lower() for marker in SECONDARY_LIMIT_MARKERS):
+            delay = SECONDARY_LIMIT_BACKOFF
+        elif status == 429:
+            delay = SECONDARY_LIMIT_BACKOFF
+        else:
+            return None
+
+        budget.blocked_until = max(budget.blocked_until, now + delay)
+        budget.rate_limited += 1
+        logger.warning(f"GitHub 返回限流响应 {status}，暂停该 token 的请求 {delay:.0f} 秒")
+        return delay
+
+    def get_budget(self, token: str) -> Optional[Dict[str, Any]]:
+        budget = self._budgets.get(ResponseCache.token_hash(token))
+        return budget.to_dict() if budget is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": len(self._budgets),
+            "burst": self.burst,
+            "reserve": self.reserve,
+            "max_wait": self.max_wait,
+            "requests": sum(budget.requests for budget in self._budgets.values()),
+            "waiting": sum(budget.waiting for budget in self._budgets.values()),
+            "throttled": sum(budget.throttled for budget in self._budgets.values()),
+            "rate_limited": sum(budget.rate_limited for budget in self._budgets.values()),
+            "lowest_remaining": min(
+                (budget.remaining for budget in self._budgets.values() if budget.remaining is not None),
+                default=None
+            ),
+        }
@@ -0,0 +1,109 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+from app.core.config import settings
+from app.services.github_cache import ResponseCache
+from app.services.github_client import github_client
+
+logger = logging.getLogger(__name__)
+
+
+class RepoMetadata:
+    """仓库元数据缓存：默认分支和各分支最新提交 SHA。
+    仓库信息、分支列表和分支详情接口返回的数据都会顺带登记；本服务推送或创建分支后立即更新，
+    常见情况下创建分支只需要一次 POST 请求。"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._default_branches: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._branch_shas: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.updates = 0
+
+    @staticmethod
+    def _headers(token: str) -> Dict[str, str]:
+        return {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+    def _lookup(self, cache: Dict, key: Tuple) -> Optional[str]:
+        item = cache.get(key)
+        if item is not None and time.monotonic() - item[1] < self.ttl:
+            self.hits += 1
+            return item[0]
+        cache.pop(key, None)
+        self.misses += 1
+        return None
+
+    def remember_default_branch(self, token: str, repo: str, branch: Optional[str]):
+        if branch:
+            self._default_branches[(ResponseCache.token_hash(token), repo)] = (branch, time.monotonic())
+
+    def remember_branch_sha(self, token: str, repo: str, branch: str, sha: Optional[str]):
+        if sha:
+            self._branch_shas[(ResponseCache.token_hash(token), repo, branch)] = (sha, time.monotonic())
+
+    def remember_branches(self, token: str, repo: str, branches: List[Dict[str, Any]]):
+        """分支列表接口的每一项都带有 commit.sha"""
+        for item in branches:
+            name = item.get("name")
+            if name:
+                self.remember_branch_sha(token, repo, name, (item.get("commit") or {}).get("sha"))
+
+    async def get_default_branch(self, token: str, repo: str) -> Optional[str]:
+        cached = self._lookup(self._default_branches, (ResponseCache.token_hash(token), repo))
+        if cached:
+            return cached
+        response = await github_client.get_json(f"{settings.GITHUB_API_URL}/repos/{repo}", self._headers(token), token)
+        if response.status != 200:
+            return None
+        branch = response.data.get("default_branch")
+        self.remember_default_branch(token, repo, branch)
+        return branch
+
+    async def get_branch_sha(self, token: str, repo: str, branch: str) -> Optional[str]:
+        cached = self._lookup(self._branch_shas, (ResponseCache.token_hash(token), repo, branch))
+        if cached:
+            return cached
+        response = await github_client.get_json(
+            f"{settings.GITHUB_API_URL}/repos/{repo}/git/refs/heads/{branch}", self._headers(token), token
+        )
+        if response.status != 200:
+            return None
+        sha = response.data.get("object", {}).get("sha")
+        self.remember_branch_sha(token, repo, branch, sha)
+        return sha
+
+    def branch_updated(self, token: str, repo: str, branch: str, sha: Optional[str] = None):
+        """本服务推送或创建了分支：丢弃该分支相关的响应缓存，已知新 SHA 时直接登记"""
+        base = f"{settings.GITHUB_API_URL}/repos/{repo}"
+        github_client.cache.invalidate(token, f"{base}/branches")
+        github_client.cache.invalidate(token, f"{base}/git/refs/heads/{branch}")
+        key = (ResponseCache.token_hash(token), repo, branch)
+        if sha:
+            self._branch_shas[key] = (sha, time.monotonic())
+        else:
+            self._branch_shas.pop(key, None)
+        self.updates += 1
+
+    def clear(self):
+        self._default_branches.clear()
+        self._branch_shas.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "default_branches": len(self._default_branches),
+            "branch_shas": len(self._branch_shas),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "updates": self.updates,
+        }
+
+
+repo_metadata = RepoMetadata(settings.REPO_METADATA_TTL)
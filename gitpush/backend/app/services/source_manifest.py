@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+StatKey = Tuple[int, int, int]
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def blob_hasher(size: int) -> "hashlib._Hash":
+    """返回已写入 git blob 头部的 sha1 对象，与 git hash-object 结果一致"""
+    hasher = hashlib.sha1()
+    hasher.update(b"blob %d\0" % size)
+    return hasher
+
+
+def hash_file(path: Path, size: Optional[int] = None) -> str:
+    if size is None:
+        size = os.stat(path).st_size
+    hasher = blob_hasher(size)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class SourceManifest:
+    """按 (源路径, 仓库, 分支) 持久化的源文件快照：记录源文件与工作区副本的 (size, mtime_ns, inode) 及内容哈希。
+    源文件和工作区副本的 stat 都与上次记录一致时，无需读取文件即可判定内容相同。"""
+
+    VERSION = 1
+
+    def __init__(self, path: Path, source: str, repo: str, branch: str):
+        self.path = path
+        self.source = source
+        self.repo = repo
+        self.branch = branch
+        self._entries: Dict[str, List[Any]] = {}
+        self._observed: Dict[str, StatKey] = {}
+        self._updated: Dict[str, List[Any]] = {}
+        self.unchanged = 0
+        self.changed = 0
+        self.new = 0
+        self.fast_skips = 0
+
+    @staticmethod
+    def manifest_path(manifest_dir: Path, source: str, repo: str, branch: str) -> Path:
+        digest = hashlib.sha1(f"{source}\0{repo}\0{branch}".encode("utf-8")).hexdigest()
+        return manifest_dir / f"{digest}.json"
+
+    @classmethod
+    def load(cls, manifest_dir: Path, source: str, repo: str, branch: str) -> "SourceManifest":
+        manifest = cls(cls.manifest_path(manifest_dir, source, repo, branch), source, repo, branch)
+        try:
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == cls.VERSION and data.get("source") == source:
+                manifest._entries = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取源文件快照失败，将重新建立: {manifest.path}, 错误: {e}")
+        return manifest
+
+    def observe(self, rel_path: str, size: int, mtime_ns: int, inode: int) -> str:
+        """登记本次扫描到的源文件，返回 unchanged / changed / new"""
+        key = (size, mtime_ns, inode)
+        self._observed[rel_path] = key
+        entry = self._entries.get(rel_path)
+        if entry is None:
+            self.new += 1
+            return "new"
+        if tuple(entry[:3]) == key:
+            self.unchanged += 1
+            return "unchanged"
+        self.changed += 1
+        return "changed"
+
+    def is_unchanged(self, rel_path: str) -> bool:
+        key = self._observed.get(rel_path)
+        entry = self._entries.get(rel_path)
+        return key is not None and entry is not None and tuple(entry[:3]) == key
+
+    def known_hash(self, rel_path: str) -> Optional[str]:
+        updated = self._updated.get(rel_path)
+        if updated is not None:
+            return updated[3]
+        return self._entries[rel_path][3] if self.is_unchanged(rel_path) else None
+
+    def dest_matches(self, rel_path: str, dest_path: Path) -> bool:
+        """源文件未变且工作区副本仍是上次记录时的状态"""
+        if not self.is_unchanged(rel_path):
+            return False
+        entry = self._entries[rel_path]
+        try:
+            return tuple(entry[4:7]) == stat_key(os.stat(dest_path))
+        except OSError:
+            return False
+
+    def record(self, rel_path: str, dest_path: Optional[Path], content_hash: Optional[str] = None):
+        """记录本次处理结果；dest_path 为 None 表示没有工作区副本（索引引擎），只保存哈希"""
+        key = self._observed.get(rel_path)
+        if key is None:
+            return
+        dest_key = (None, None, None)
+        if dest_path is not None:
+            try:
+                dest_key = stat_key(os.stat(dest_path))
+            except OSError:
+                return
+        if content_hash is None:
+            content_hash = self.known_hash(rel_path)
+        self._updated[rel_path] = [*key, content_hash, *dest_key]
+
+    def save(self):
+        entries = {rel: self._entries[rel] for rel in self._observed if rel in self._entries and self.is_unchanged(rel)}
+        entries.update(self._updated)
+        data = {
+            "version": self.VERSION,
+            "source": self.source,
+            "repo": self.repo,
+            "branch": self.branch,
+            "updated_at": time.time(),
+            "entries": entries,
+        }
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 同一源路径的多个任务可能同时保存，各自写入独立的临时文件再原子替换
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, prefix=self.path.stem + ".", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"保存源文件快照失败: {self.path}, 错误: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "new": self.new,
+            "fast_skips": self.fast_skips,
+        }
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("done", "error", "canceled")
+
+
+class TaskEvent:
+    __slots__ = ("seq", "type", "data", "timestamp")
+
+    def __init__(self, seq: int, event_type: str, data: Dict[str, Any]):
+        self.seq = seq
+        self.type = event_type
+        self.data = data
+        self.timestamp = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "type": self.type, "timestamp": self.timestamp, "data": self.data}
+
+
+class _TaskChannel:
+    def __init__(self, capacity: int):
+        self.events: Deque[TaskEvent] = deque(maxlen=capacity)
+        self.next_seq = 1
+        self.changed = asyncio.Event()
+        self.closed = False
+
+    @property
+    def first_seq(self) -> int:
+        return self.events[0].seq if self.events else self.next_seq
+
+
+class TaskEventBus:
+    """按任务保存增量事件（状态变化、进度、输出行），支持按序号断点续传"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._channels: Dict[str, _TaskChannel] = {}
+        self.total_published = 0
+
+    def _channel(self, task_id: str) -> _TaskChannel:
+        channel = self._channels.get(task_id)
+        if channel is None:
+            channel = _TaskChannel(self.capacity)
+            self._channels[task_id] = channel
+        return channel
+
+    def publish(self, task_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        channel = self._channel(task_id)
+        event = TaskEvent(channel.next_seq, event_type, data)
+        channel.next_seq += 1
+        channel.events.append(event)
+        if event_type == "status" and data.get("status") in TERMINAL_STATUSES:
+            channel.closed = True
+        self.total_published += 1
+
+        changed = channel.changed
+        channel.changed = asyncio.Event()
+        changed.set()
+        return event.seq
+
+    def latest_seq(self, task_id: str) -> int:
+        channel = self._channels.get(task_id)
+        return channel.next_seq - 1 if channel else 0
+
+    def drop(self, task_id: str):
+        channel = self._channels.pop(task_id, None)
+        if channel:
+            channel.closed = True
+            channel.changed.set()
+
+    async def subscribe(
+        self,
+        task_id: str,
+        after_seq: int = 0,
+        heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[TaskEvent]]:
+        """产出 after_seq 之后的事件；超时无事件时产出 None 作为心跳；任务结束后退出。
+        若 after_seq 之后的事件已被环形缓冲区淘汰，先产出一个 type="gap" 的事件。"""
+        channel = self._channel(task_id)
+        last_seq = after_seq
+
+        while True:
+            if self._channels.get(task_id) is not channel:
+                return
+            changed = channel.changed
+
+            if channel.events and last_seq + 1 < channel.first_seq:
+                yield TaskEvent(channel.first_seq - 1, "gap", {"missed_from": last_seq + 1, "missed_to": channel.first_seq - 1})
+                last_seq = channel.first_seq - 1
+
+            pending = [event for event in channel.events if event.seq > last_seq]
+            for event in pending:
+                last_seq = event.seq
+                yield event
+
+            if channel.closed and last_seq >= channel.next_seq - 1:
+                return
+
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "channels": len(self._channels),
+            "buffered_events": sum(len(channel.events) for channel in self._channels.values()),
+            "total_published": self.total_published,
+        }
+
+
+task_events = TaskEventBus()
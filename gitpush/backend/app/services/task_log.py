@@ -0,0 +1,181 @@
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+LogEntry = Tuple[int, str, str, float]
+
+
+class TaskLog:
+    """任务日志环形缓冲区：内存中只保留最近的行，被淘汰的行可追加到磁盘文件。
+    落盘文件在第一次淘汰时打开并保持到 release()/close()，写入经过缓冲，读取前先刷新"""
+
+    SPILL_INDEX_STRIDE = 256
+
+    def __init__(
+        self,
+        task_id: str,
+        max_lines: int = 2000,
+        max_bytes: int = 256 * 1024,
+        spill_dir: Optional[Path] = None
+    ):
+        self.task_id = task_id
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+
+        self._entries: Deque[LogEntry] = deque()
+        self._bytes = 0
+        self._next_offset = 0
+        self._spilled_lines = 0
+        self._dropped_lines = 0
+        self._spill_path: Optional[Path] = None
+        self._spill_file: Optional[BinaryIO] = None
+        self._spill_base = 0
+        self._spill_index: List[int] = []
+        self._spill_size = 0
+
+    @property
+    def total_lines(self) -> int:
+        return self._next_offset
+
+    @property
+    def first_offset(self) -> int:
+        return self._entries[0][0] if self._entries else self._next_offset
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def spill_path(self) -> Optional[Path]:
+        return self._spill_path
+
+    def append(self, stream: str, line: str) -> int:
+        offset = self._next_offset
+        self._next_offset += 1
+        self._entries.append((offset, stream, line, time.time()))
+        self._bytes += len(line)
+
+        while self._entries and (len(self._entries) > self.max_lines or self._bytes > self.max_bytes):
+            self._evict(self._entries.popleft())
+        return offset
+
+    def _evict(self, entry: LogEntry):
+        offset, stream, line, timestamp = entry
+        self._bytes -= len(line)
+
+        if self.spill_dir is None:
+            self._dropped_lines += 1
+            return
+
+        try:
+            if self._spill_path is None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                self._spill_path = self.spill_dir / f"{self.task_id}.log"
+                self._spill_base = offset
+                self._spill_size = 0
+            if self._spilled_lines % self.SPILL_INDEX_STRIDE == 0:
+                self._spill_index.append(self._spill_size)
+            record = f"{stream}\t{timestamp:.3f}\t{line}\n".encode("utf-8")
+            if self._spill_file is None:
+                # 恢复的任务沿用原 task_id，第一次落盘时截断上次运行留下的同名文件，保证偏移量与文件内容一致
+                self._spill_file = open(self._spill_path, "ab" if self._spilled_lines else "wb")
+            self._spill_file.write(record)
+            self._spill_size += len(record)
+            self._spilled_lines += 1
+        except OSError as e:
+            logger.warning(f"任务日志写入磁盘失败，停止落盘: task_id={self.task_id}, 错误: {e}")
+            self.spill_dir = None
+            self._dropped_lines += 1
+            self.release()
+
+    def _read_spilled(self, offset: int, limit: int) -> List[LogEntry]:
+        offset -= self._spill_base
+        if self._spill_path is None or offset < 0 or offset >= self._spilled_lines:
+            return []
+
+        entries = []
+        block = offset // self.SPILL_INDEX_STRIDE
+        if self._spill_file is not None:
+            try:
+                self._spill_file.flush()
+            except OSError as e:
+                logger.warning(f"刷新任务日志文件失败: task_id={self.task_id}, 错误: {e}")
+        current = block * self.SPILL_INDEX_STRIDE
+        try:
+            with open(self._spill_path, "rb") as f:
+                f.seek(self._spill_index[block])
+                for raw in f:
+                    if current >= self._spilled_lines or len(entries) >= limit:
+                        break
+                    if current >= offset:
+                        stream, timestamp, line = raw.decode("utf-8", errors="ignore").rstrip("\n").split("\t", 2)
+                        entries.append((self._spill_base + current, stream, line, float(timestamp)))
+                    current += 1
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取任务日志文件失败: task_id={self.task_id}, 错误: {e}")
+        return entries
+
+    def read(self, offset: int = 0, limit: int = 200) -> List[LogEntry]:
+        entries: List[LogEntry] = []
+
+        if offset < self.first_offset and self._spill_path is not None:
+            entries.extend(self._read_spilled(max(offset, self._spill_base), limit))
+        offset = max(offset, self.first_offset)
+
+        for entry in self._entries:
+            if len(entries) >= limit:
+                break
+            if entry[0] >= offset:
+                entries.append(entry)
+        return entries
+
+    def tail(self, count: int = 50, stream: Optional[str] = None) -> List[str]:
+        lines = []
+        for _, entry_stream, line, _ in reversed(self._entries):
+            if stream is not None and entry_stream != stream:
+                continue
+            lines.append(line)
+            if len(lines) >= count:
+                break
+        lines.reverse()
+        return lines
+
+    def tail_text(self, count: int = 50, stream: Optional[str] = None) -> str:
+        lines = self.tail(count, stream)
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def release(self):
+        """关闭落盘文件句柄；之后再有行被淘汰时以追加方式重新打开"""
+        if self._spill_file is None:
+            return
+        try:
+            self._spill_file.close()
+        except OSError as e:
+            logger.warning(f"关闭任务日志文件失败: task_id={self.task_id}, 错误: {e}")
+        self._spill_file = None
+
+    def close(self, delete: bool = True):
+        self.release()
+        self._entries.clear()
+        self._bytes = 0
+        if delete and self._spill_path is not None:
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+            self._spill_path = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total_lines": self.total_lines,
+            "memory_lines": len(self._entries),
+            "memory_bytes": self._bytes,
+            "spilled_lines": self._spilled_lines,
+            "dropped_lines": self._dropped_lines,
+        }
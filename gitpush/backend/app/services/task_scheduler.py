@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskScheduler:
+    """基于并发槽位的任务调度器：按优先级出队，任务入队或结束时立即调度。
+    提供 coalesce_key 时，出队任务会带走队列中合并键相同的待执行任务，由 runner(task, followers) 一次执行"""
+
+    def __init__(
+        self,
+        runner: Callable[..., Awaitable[None]],
+        max_concurrent: int = 2,
+        conflict_key: Optional[Callable[[Any], str]] = None,
+        coalesce_key: Optional[Callable[[Any], Optional[str]]] = None,
+        max_batch: int = 1
+    ):
+        self._runner = runner
+        self.max_concurrent = max_concurrent
+        self._conflict_key = conflict_key
+        self._coalesce_key = coalesce_key
+        self.max_batch = max_batch
+        self._active_keys: Dict[str, str] = {}
+        self._heap: List[Tuple[int, int, Any]] = []
+        self._seq = itertools.count()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._closed = False
+
+        self.total_submitted = 0
+        self.total_started = 0
+        self.total_deferred = 0
+        self.total_batches = 0
+        self.total_coalesced = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.last_wait_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, task in self._heap if task.status == "pending")
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def free_slots(self) -> int:
+        return max(0, self.max_concurrent - len(self._running))
+
+    def submit(self, task: Any):
+        if self._closed:
+            raise RuntimeError("调度器已关闭")
+        task.queued_at = time.time()
+        heapq.heappush(self._heap, (-task.priority, next(self._seq), task))
+        self.total_submitted += 1
+        logger.info(f"任务已入队: task_id={task.task_id}, priority={task.priority}, 队列深度={self.queue_depth}")
+        self._dispatch()
+
+    def discard(self, task_id: str) -> bool:
+        for index, (_, _, task) in enumerate(self._heap):
+            if task.task_id == task_id:
+                self._heap.pop(index)
+                heapq.heapify(self._heap)
+                return True
+        return False
+
+    def get_queue_position(self, task_id: str) -> Optional[int]:
+        ordered = sorted(entry for entry in self._heap if entry[2].status == "pending")
+        for position, (_, _, task) in enumerate(ordered, start=1):
+            if task.task_id == task_id:
+                return position
+        return None
+
+    def _dispatch(self):
+        deferred = []
+        while self._heap and len(self._running) < self.max_concurrent and not self._closed:
+            entry = heapq.heappop(self._heap)
+            task = entry[2]
+            if task.status != "pending":
+                continue
+            key = self._conflict_key(task) if self._conflict_key else None
+            if key is not None and key in self._active_keys:
+                deferred.append(entry)
+                continue
+            self._start(task, key, self._take_followers(task))
+
+        if deferred:
+            self.total_deferred += len(deferred)
+            for entry in deferred:
+                heapq.heappush(self._heap, entry)
+
+    def _take_followers(self, task: Any) -> List[Any]:
+        """从队列中取出可与 task 合并执行的待执行任务，保持优先级顺序"""
+        if self._coalesce_key is None or self.max_batch <= 1:
+            return []
+        key = self._coalesce_key(task)
+        if key is None:
+            return []
+        followers = []
+        remaining = []
+        for entry in sorted(self._heap):
+            candidate = entry[2]
+            if (
+                len(followers) < self.max_batch - 1
+                and candidate.status == "pending"
+                and self._coalesce_key(candidate) == key
+            ):
+                followers.append(candidate)
+            else:
+                remaining.append(entry)
+        if followers:
+            self._heap = remaining
+            heapq.heapify(self._heap)
+        return followers
+
+    def _record_wait(self, task: Any, now: float):
+        wait_time = now - task.queued_at if task.queued_at else 0.0
+        task.wait_time = wait_time
+        self.total_started += 1
+        self.total_wait_time += wait_time
+        self.last_wait_time = wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        return wait_time
+
+    def _start(self, task: Any, key: Optional[str] = None, followers: Optional[List[Any]] = None):
+        now = time.time()
+        wait_time = self._record_wait(task, now)
+
+        logger.info(f"调度任务: task_id={task.task_id}, priority={task.priority}, 等待 {wait_time * 1000:.1f}ms")
+        if followers:
+            for follower in followers:
+                self._record_wait(follower, now)
+            self.total_batches += 1
+            self.total_coalesced += len(followers)
+            logger.info(f"合并执行 {len(followers)} 个同目标任务: leader={task.task_id}, followers={[f.task_id for f in followers]}")
+            runner_task = asyncio.create_task(self._runner(task, followers))
+        else:
+            runner_task = asyncio.create_task(self._runner(task))
+        self._running[task.task_id] = runner_task
+        if key is not None:
+            self._active_keys[key] = task.task_id
+        runner_task.add_done_callback(lambda _: self._on_task_done(task.task_id, key))
+
+    def _on_task_done(self, task_id: str, key: Optional[str] = None):
+        self._running.pop(task_id, None)
+        if key is not None and self._active_keys.get(key) == task_id:
+            del self._active_keys[key]
+        self._dispatch()
+
+    def get_running_task(self, task_id: str) -> Optional[asyncio.Task]:
+        return self._running.get(task_id)
+
+    def close(self):
+        self._closed = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        avg_wait = self.total_wait_time / self.total_started if self.total_started > 0 else 0.0
+        return {
+            "queue_depth": self.queue_depth,
+            "running": self.running_count,
+            "max_concurrent": self.max_concurrent,
+            "free_slots": self.free_slots,
+            "total_submitted": self.total_submitted,
+            "total_started": self.total_started,
+            "total_deferred": self.total_deferred,
+            "total_batches": self.total_batches,
+            "total_coalesced": self.total_coalesced,
+            "active_keys": len(self._active_keys),
+            "avg_wait_ms": round(avg_wait * 1000, 2),
+            "max_wait_ms": round(self.max_wait_time * 1000, 2),
+            "last_wait_ms": round(self.last_wait_time * 1000, 2),
+        }
@@ -0,0 +1,277 @@
+import asyncio
+import base64
+import json
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import logging
+from sqlalchemy import Column, Float, Index, MetaData, String, Table, Text, delete, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from app.core.config import DEFAULT_JWT_SECRET, settings
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running")
+TERMINAL_STATUSES = ("done", "error", "canceled")
+
+metadata = MetaData()
+
+git_tasks = Table(
+    "git_tasks",
+    metadata,
+    Column("task_id", String(64), primary_key=True),
+    Column("status", String(16), nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),
+    Column("started_at", Float),
+    Column("completed_at", Float),
+    Column("repo", String(255), nullable=False),
+    Column("branch", String(255)),
+    Column("token", Text),
+    Column("request", Text, nullable=False),
+    Column("progress", Text),
+    Column("error", Text),
+    Column("summary", Text),
+    Index("ix_git_tasks_status", "status"),
+    Index("ix_git_tasks_created_at", "created_at"),
+)
+
+JSON_COLUMNS = ("request", "summary")
+
+
+@lru_cache(maxsize=4)
+def _token_fernet(secret: str) -> Fernet:
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"gitpush-task-token").derive(secret.encode("utf-8"))
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def token_persistence_enabled() -> bool:
+    """只有显式开启且 JWT_SECRET 不是公开的默认值时才保存 token"""
+    return settings.TASK_STORE_PERSIST_TOKEN and settings.JWT_SECRET != DEFAULT_JWT_SECRET
+
+
+def seal_token(token: Optional[str]) -> Optional[str]:
+    """用 JWT_SECRET 经 HKDF 派生的密钥以 Fernet 加密 token"""
+    if not token:
+        return None
+    return _token_fernet(settings.JWT_SECRET).encrypt(token.encode("utf-8")).decode("ascii")
+
+
+def open_token(value: Optional[str]) -> Optional[str]:
+    """解密 seal_token 的结果；格式不对、被篡改或 JWT_SECRET 已更换时返回 None"""
+    if not value:
+        return None
+    try:
+        return _token_fernet(settings.JWT_SECRET).decrypt(value.encode("ascii")).decode("utf-8")
+    except (InvalidToken, UnicodeError):
+        return None
+
+
+class TaskStore:
+    """SQLite 持久化的推送任务表。任务创建时立即写入；状态和进度变化只登记到内存中的脏集合，
+    由后台协程按间隔或批量大小合并写入，执行路径不等待磁盘。
+    开启 TASK_STORE_PERSIST_TOKEN 且设置了 JWT_SECRET 时，未结束任务的 token 加密后保存，用于重启后恢复排队中的任务；
+    否则不保存 token，重启后排队中的任务无法恢复。"""
+
+    def __init__(self, database_url: str, flush_interval: float, batch_size: int):
+        self.database_url = database_url
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._engine: Optional[AsyncEngine] = None
+        self._dirty: Dict[str, Any] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self.recovered = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._engine is not None and not self._closed
+
+    @staticmethod
+    def _async_url(database_url: str) -> Optional[str]:
+        url = make_url(database_url)
+        if url.get_backend_name() != "sqlite":
+            return None
+        return str(url.set(drivername="sqlite+aiosqlite"))
+
+    async def start(self):
+        if not settings.TASK_STORE_ENABLED:
+            return
+        async_url = self._async_url(self.database_url)
+        if async_url is None:
+            logger.warning(f"任务持久化仅支持 SQLite，已禁用: {self.database_url}")
+            return
+        try:
+            engine = create_async_engine(async_url)
+
+            @event.listens_for(engine.sync_engine, "connect")
+            def _set_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+
+            async with engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+        except Exception as e:
+            logger.error(f"初始化任务存储失败，任务将只保存在内存中: {e}")
+            return
+        self._engine = engine
+        self._closed = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher = asyncio.create_task(self._flush_loop())
+        if settings.TASK_STORE_PERSIST_TOKEN and not token_persistence_enabled():
+            logger.warning("JWT_SECRET 仍为默认值，不保存任务的 token；重启后排队中的任务无法恢复")
+        logger.info(f"任务存储已启动: {make_url(async_url).database}")
+
+    async def close(self):
+        """停止后台写入并把剩余的变化写入磁盘；之后的状态变化不再持久化"""
+        if self._engine is None:
+            return
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        self._closed = True
+        await self._engine.dispose()
+        self._engine = None
+        logger.info("任务存储已关闭")
+
+    def mark_dirty(self, task: Any):
+        if not self.enabled:
+            return
+        self._dirty[task.task_id] = task
+        if len(self._dirty) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def insert(self, task: Any):
+        """新任务立即写入，保证接口返回 task_id 时任务已经落盘"""
+        if not self.enabled:
+            return
+        self._dirty.pop(task.task_id, None)
+        await self._write([task.to_record()])
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        if self._engine is None or not self._dirty:
+            return
+        async with self._flush_lock:
+            pending, self._dirty = self._dirty, {}
+            records = [task.to_record() for task in pending.values()]
+            try:
+                await self._write(records)
+            except Exception as e:
+                self.flush_errors += 1
+                logger.error(f"写入任务状态失败，将在下次重试: {e}")
+                for task_id, task in pending.items():
+                    self._dirty.setdefault(task_id, task)
+
+    async def _write(self, records: List[Dict[str, Any]]):
+        started = time.perf_counter()
+        rows = []
+        for record in records:
+            row = dict(record)
+            for name in JSON_COLUMNS:
+                row[name] = json.dumps(row[name], ensure_ascii=False)
+            if row["status"] in ACTIVE_STATUSES and token_persistence_enabled():
+                row["token"] = seal_token(row["token"])
+            else:
+                row["token"] = None
+            rows.append(row)
+        statement = sqlite_insert(git_tasks)
+        statement = statement.on_conflict_do_update(
+            index_elements=[git_tasks.c.task_id],
+            set_={
+                name: statement.excluded[name]
+                for name in (
+                    "status", "updated_at", "started_at", "completed_at",
+                    "token", "progress", "error", "summary",
+                )
+            }
+        )
+        async with self._engine.begin() as conn:
+            await conn.execute(statement, rows)
+        self.flushes += 1
+        self.rows_written += len(rows)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def _decode(row) -> Dict[str, Any]:
+        data = dict(row._mapping)
+        for name in JSON_COLUMNS:
+            data[name] = json.loads(data[name]) if data.get(name) else {}
+        data["token"] = open_token(data.get("token"))
+        return data
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        if self._engine is None:
+            return None
+        async with self._engine.connect() as conn:
+            result = await conn.execute(select(git_tasks).where(git_tasks.c.task_id == task_id))
+            row = result.first()
+        return self._decode(row) if row is not None else None
+
+    async def load_active(self) -> List[Dict[str, Any]]:
+        """上次运行时未结束的任务，按创建时间排序"""
+        if self._engine is None:
+            return []
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
+                select(git_tasks)
+                .where(git_tasks.c.status.in_(ACTIVE_STATUSES))
+                .order_by(git_tasks.c.created_at)
+            )
+            return [self._decode(row) for row in result]
+
+    async def prune(self, max_age_seconds: float) -> int:
+        if self._engine is None:
+            return 0
+        cutoff = time.time() - max_age_seconds
+        async with self._engine.begin() as conn:
+            result = await conn.execute(
+                delete(git_tasks)
+                .where(git_tasks.c.status.in_(TERMINAL_STATUSES))
+                .where(git_tasks.c.created_at < cutoff)
+            )
+        if result.rowcount:
+            logger.info(f"清理过期任务记录: {result.rowcount} 条")
+        return result.rowcount or 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending_writes": len(self._dirty),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "avg_batch": round(self.rows_written / self.flushes, 2) if self.flushes else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "flush_errors": self.flush_errors,
+            "recovered": self.recovered,
+        }
+
+
+task_store = TaskStore(settings.DATABASE_URL, settings.TASK_STORE_FLUSH_INTERVAL, settings.TASK_STORE_BATCH_SIZE)
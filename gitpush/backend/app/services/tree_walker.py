@@ -0,0 +1,201 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+import logging
+from app.core.config import settings
+from app.services.ignore_matcher import IgnoreMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class WalkEntry(NamedTuple):
+    rel_path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+class _DirScan(NamedTuple):
+    files: List[WalkEntry]
+    subdirs: List[Tuple[str, str]]
+    dir_count: int
+    entry_count: int
+    pruned_dirs: int
+    ignored_files: int
+    unreadable_files: int
+
+
+class WalkResult:
+    def __init__(self, root: Path):
+        self.root = root
+        self.files: List[WalkEntry] = []
+        self.empty_dirs: List[str] = []
+        self.dir_count = 0
+        self.pruned_dirs = 0
+        self.ignored_files = 0
+        self.unreadable_files = 0
+        self.errors: List[Tuple[str, str]] = []
+        self.root_entry_count = 0
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files) + self.unreadable_files
+
+    @property
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.files)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self.files),
+            "dirs": self.dir_count,
+            "empty_dirs": len(self.empty_dirs),
+            "pruned_dirs": self.pruned_dirs,
+            "ignored_files": self.ignored_files,
+            "unreadable_files": self.unreadable_files,
+            "errors": len(self.errors),
+        }
+
+
+class TreeWalker:
+    """基于 os.scandir 的目录遍历：复用 DirEntry 的类型信息，子目录在有界线程池中并行扫描。
+    与 os.walk 一致，指向目录的符号链接计入目录数但不会进入。"""
+
+    @staticmethod
+    def _scan_dir(abs_dir: str, rel_dir: str, ignore_matcher: Optional[IgnoreMatcher]) -> _DirScan:
+        files: List[WalkEntry] = []
+        subdirs: List[Tuple[str, str]] = []
+        dir_count = 0
+        entry_count = 0
+        pruned_dirs = 0
+        ignored_files = 0
+        unreadable_files = 0
+        prefix = rel_dir + "/" if rel_dir else ""
+
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                entry_count += 1
+                rel = prefix + entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if ignore_matcher is not None and ignore_matcher.is_dir_ignored(rel):
+                        pruned_dirs += 1
+                        continue
+                    dir_count += 1
+                    try:
+                        is_link = entry.is_symlink()
+                    except OSError:
+                        is_link = True
+                    if not is_link:
+                        subdirs.append((entry.path, rel))
+                    continue
+
+                if ignore_matcher is not None and ignore_matcher.is_ignored(rel):
+                    ignored_files += 1
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError as e:
+                    logger.warning(f"无法读取文件大小: {entry.path}, 错误: {e}")
+                    unreadable_files += 1
+                    continue
+                files.append(WalkEntry(rel, st.st_size, st.st_mtime_ns, st.st_ino))
+
+        return _DirScan(files, subdirs, dir_count, entry_count, pruned_dirs, ignored_files, unreadable_files)
+
+    @staticmethod
+    def _merge(result: WalkResult, rel_dir: str, scan: _DirScan):
+        result.files.extend(scan.files)
+        result.dir_count += scan.dir_count
+        result.pruned_dirs += scan.pruned_dirs
+        result.ignored_files += scan.ignored_files
+        result.unreadable_files += scan.unreadable_files
+        if not rel_dir:
+            result.root_entry_count = scan.entry_count
+        elif scan.entry_count == 0:
+            result.empty_dirs.append(rel_dir)
+
+    @staticmethod
+    def measure(
+        root: Union[str, Path],
+        ignore_matcher: Optional[IgnoreMatcher] = None,
+        max_files: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """只统计 root 下未被忽略的文件数和总字节数，不保留文件列表；
+        超过 max_files 或 max_bytes 后立即停止，返回截至当时的统计值"""
+        files = 0
+        total_bytes = 0
+        pending_dirs = [(str(root), "")]
+        while pending_dirs:
+            abs_dir, rel_dir = pending_dirs.pop()
+            try:
+                scan = TreeWalker._scan_dir(abs_dir, rel_dir, ignore_matcher)
+            except OSError:
+                if not rel_dir:
+                    raise
+                continue
+            files += len(scan.files) + scan.unreadable_files + (1 if rel_dir and scan.entry_count == 0 else 0)
+            total_bytes += sum(entry.size for entry in scan.files)
+            if (max_files is not None and files > max_files) or (max_bytes is not None and total_bytes > max_bytes):
+                break
+            pending_dirs.extend(scan.subdirs)
+        return files, total_bytes
+
+    @staticmethod
+    def walk(
+        root: Union[str, Path],
+        ignore_matcher: Optional[IgnoreMatcher] = None,
+        max_workers: Optional[int] = None
+    ) -> WalkResult:
+        """遍历 root 下的所有文件，返回按相对路径排序的 WalkEntry 列表。
+        根目录无法读取时抛出 OSError；子目录读取失败记录在 errors 中并继续。"""
+        root = Path(root)
+        result = WalkResult(root)
+        workers = max_workers if max_workers is not None else settings.TREE_WALK_WORKERS
+
+        root_scan = TreeWalker._scan_dir(str(root), "", ignore_matcher)
+        TreeWalker._merge(result, "", root_scan)
+        pending_dirs = list(root_scan.subdirs)
+
+        def scan_subdir(abs_dir: str, rel_dir: str) -> Optional[_DirScan]:
+            try:
+                return TreeWalker._scan_dir(abs_dir, rel_dir, ignore_matcher)
+            except OSError as e:
+                logger.warning(f"无法扫描目录: {abs_dir}, 错误: {e}")
+                result.errors.append((rel_dir, str(e)))
+                return None
+
+        if workers <= 1 or len(pending_dirs) <= 1:
+            while pending_dirs:
+                abs_dir, rel_dir = pending_dirs.pop()
+                scan = scan_subdir(abs_dir, rel_dir)
+                if scan is not None:
+                    TreeWalker._merge(result, rel_dir, scan)
+                    pending_dirs.extend(scan.subdirs)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tree-walk") as executor:
+                running: Dict[Future, str] = {}
+                for abs_dir, rel_dir in pending_dirs:
+                    running[executor.submit(scan_subdir, abs_dir, rel_dir)] = rel_dir
+
+                while running:
+                    done: Set[Future]
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rel_dir = running.pop(future)
+                        scan = future.result()
+                        if scan is None:
+                            continue
+                        TreeWalker._merge(result, rel_dir, scan)
+                        for abs_dir, sub_rel in scan.subdirs:
+                            running[executor.submit(scan_subdir, abs_dir, sub_rel)] = sub_rel
+
+        result.files.sort()
+        result.empty_dirs.sort()
+        return result
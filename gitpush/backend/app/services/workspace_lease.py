@@ -0,0 +1,177 @@
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional, Any
+import logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+
+def _try_lock_file(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(fd: int):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    except OSError as e:
+        logger.warning(f"释放文件锁失败: {e}")
+
+
+class WorkspaceLease:
+    def __init__(self, manager: "WorkspaceLeaseManager", key: str, owner: str, fd: int, acquired_at: float):
+        self.manager = manager
+        self.key = key
+        self.owner = owner
+        self.fd = fd
+        self.acquired_at = acquired_at
+        self.released = False
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+        self.manager._release(self)
+
+
+class WorkspaceLeaseManager:
+    """按工作区加锁：同一工作区串行，不同工作区并行；文件锁保证跨进程互斥"""
+
+    def __init__(self, lock_dir: Path, poll_interval: float = 0.1):
+        self.lock_dir = lock_dir
+        self.poll_interval = poll_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiters: Dict[str, int] = {}
+        self._holders: Dict[str, WorkspaceLease] = {}
+
+        self.total_acquired = 0
+        self.total_contended = 0
+        self.total_wait_time = 0.0
+
+    @staticmethod
+    def _lock_filename(key: str) -> str:
+        return re.sub(r"[^A-Za-z0-9._-]", "_", key) + ".lock"
+
+    def is_leased(self, key: str) -> bool:
+        return key in self._holders
+
+    def is_busy(self, key: str) -> bool:
+        """本进程持有租约，或锁文件被其他进程锁定"""
+        if key in self._holders:
+            return True
+        path = self.lock_dir / self._lock_filename(key)
+        try:
+            fd = os.open(str(path), os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            return True
+        try:
+            if not _try_lock_file(fd):
+                return True
+            _unlock_file(fd)
+            return False
+        finally:
+            os.close(fd)
+
+    def get_holder(self, key: str) -> Optional[str]:
+        lease = self._holders.get(key)
+        return lease.owner if lease else None
+
+    async def acquire(self, key: str, owner: str) -> WorkspaceLease:
+        start = time.time()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        contended = lock.locked()
+
+        try:
+            await lock.acquire()
+        finally:
+            self._waiters[key] -= 1
+
+        try:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.lock_dir / self._lock_filename(key)), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                while not _try_lock_file(fd):
+                    if not contended:
+                        contended = True
+                        logger.info(f"工作区被其他进程占用，等待释放: key={key}, owner={owner}")
+                    await asyncio.sleep(self.poll_interval)
+            except BaseException:
+                os.close(fd)
+                raise
+        except BaseException:
+            self._cleanup_key(key)
+            lock.release()
+            raise
+
+        wait_time = time.time() - start
+        lease = WorkspaceLease(self, key, owner, fd, time.time())
+        self._holders[key] = lease
+        self.total_acquired += 1
+        self.total_wait_time += wait_time
+        if contended:
+            self.total_contended += 1
+            logger.info(f"获得工作区租约: key={key}, owner={owner}, 等待 {wait_time:.2f}s")
+        return lease
+
+    def _release(self, lease: WorkspaceLease):
+        _unlock_file(lease.fd)
+        try:
+            os.close(lease.fd)
+        except OSError:
+            pass
+        if self._holders.get(lease.key) is lease:
+            del self._holders[lease.key]
+        lock = self._locks.get(lease.key)
+        self._cleanup_key(lease.key)
+        if lock and lock.locked():
+            lock.release()
+
+    def _cleanup_key(self, key: str):
+        if self._waiters.get(key, 0) == 0 and key not in self._holders:
+            self._waiters.pop(key, None)
+            self._locks.pop(key, None)
+
+    @asynccontextmanager
+    async def lease(self, key: str, owner: str):
+        lease = await self.acquire(key, owner)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "active_leases": len(self._holders),
+            "holders": {key: lease.owner for key, lease in self._holders.items()},
+            "waiting": sum(self._waiters.values()),
+            "total_acquired": self.total_acquired,
+            "total_contended": self.total_contended,
+            "avg_wait_ms": round(self.total_wait_time / self.total_acquired * 1000, 2) if self.total_acquired else 0.0,
+        }
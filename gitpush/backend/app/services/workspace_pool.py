@@ -0,0 +1,337 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set, TYPE_CHECKING
+import logging
+
+if TYPE_CHECKING:
+    from app.services.workspace_lease import WorkspaceLeaseManager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolEntry:
+    def __init__(self, key: str, last_used: float, size: int = 0, hits: int = 0, misses: int = 0, orphan: bool = False):
+        self.key = key
+        self.last_used = last_used
+        self.size = size
+        self.hits = hits
+        self.misses = misses
+        self.orphan = orphan
+        self.active = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "size": self.size,
+            "last_used": self.last_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "orphan": self.orphan,
+            "active": self.active,
+        }
+
+
+class WorkspacePool:
+    """管理 git_workspace 下的持久化工作区：记录大小、最近使用时间和复用命中率，
+    超出磁盘配额时按 LRU 淘汰空闲工作区。删除先改名移入回收目录，再在后台线程中执行。
+    本进程或其他进程持有租约的工作区不会被淘汰。"""
+
+    TRASH_DIR = ".trash"
+    LOW_WATERMARK = 0.9
+
+    def __init__(
+        self,
+        root: Path,
+        state_file: Path,
+        quota_bytes: int,
+        min_idle_seconds: float,
+        lease_manager: Optional["WorkspaceLeaseManager"] = None
+    ):
+        self.root = root
+        self.state_file = state_file
+        self.quota_bytes = quota_bytes
+        self.min_idle_seconds = min_idle_seconds
+        self.lease_manager = lease_manager
+        self._entries: Dict[str, PoolEntry] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._enforce_lock: Optional[asyncio.Lock] = None
+        self._started = False
+
+        self.evictions = 0
+        self.bytes_evicted = 0
+        self.pending_deletions = 0
+        self.failed_deletions = 0
+
+    @property
+    def trash_dir(self) -> Path:
+        return self.root / self.TRASH_DIR
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry.size for entry in self._entries.values())
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self._enforce_lock = asyncio.Lock()
+        self._load()
+        self._spawn(self._startup_scan())
+
+    def _load(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, item in data.get("entries", {}).items():
+                self._entries[key] = PoolEntry(
+                    key,
+                    item.get("last_used", 0.0),
+                    item.get("size", 0),
+                    item.get("hits", 0),
+                    item.get("misses", 0),
+                    item.get("orphan", False),
+                )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取工作区池状态失败，将重新扫描: {self.state_file}, 错误: {e}")
+
+    def _save(self):
+        data = {
+            "entries": {
+                key: {
+                    "last_used": entry.last_used,
+                    "size": entry.size,
+                    "hits": entry.hits,
+                    "misses": entry.misses,
+                    "orphan": entry.orphan,
+                }
+                for key, entry in self._entries.items()
+            }
+        }
+        tmp_path = self.state_file.with_suffix(".tmp")
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"保存工作区池状态失败: {e}")
+
+    def _spawn(self, coro):
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            return
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @staticmethod
+    def _measure(path: Path) -> int:
+        """统计目录实际占用的磁盘空间；与源文件共享 inode 的硬链接删除后不会释放空间，不计入"""
+        total = 0
+        pending = [str(path)]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if st.st_nlink > 1 and not entry.is_symlink():
+                            continue
+                        blocks = getattr(st, "st_blocks", None)
+                        total += blocks * 512 if blocks is not None else st.st_size
+            except OSError:
+                continue
+        return total
+
+    async def _startup_scan(self):
+        """登记磁盘上已有但状态文件中没有的工作区（包括早期遗留的 _{uuid} 目录），并清理回收目录"""
+        try:
+            names = await asyncio.to_thread(self._list_workspaces)
+        except OSError as e:
+            logger.warning(f"扫描工作区目录失败: {e}")
+            return
+        for key, entry in list(self._entries.items()):
+            if key not in names and entry.active == 0:
+                del self._entries[key]
+        for key in names:
+            entry = self._entries.get(key)
+            if entry is None:
+                try:
+                    last_used = (self.root / key).stat().st_mtime
+                except OSError:
+                    continue
+                entry = PoolEntry(key, last_used)
+                self._entries[key] = entry
+            entry.size = await asyncio.to_thread(self._measure, self.root / key)
+        self._save()
+        if self.trash_dir.exists():
+            self._spawn(self._delete(self.trash_dir, 0))
+        await self.enforce()
+
+    def _list_workspaces(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return [
+            entry.name for entry in os.scandir(self.root)
+            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")
+        ]
+
+    def acquire(self, key: str, orphan: bool = False):
+        """任务开始使用工作区，需在工作区内执行任何命令之前调用，避免被并发淘汰"""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = PoolEntry(key, time.time(), orphan=orphan)
+            self._entries[key] = entry
+        entry.active += 1
+        entry.last_used = time.time()
+
+    def record_reuse(self, key: str, hit: bool):
+        """hit 表示复用了已有的有效仓库"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        if hit:
+            entry.hits += 1
+        else:
+            entry.misses += 1
+
+    def release(self, key: str):
+        """任务结束：后台重新统计大小并检查配额；一次性目录直接删除"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.active = max(0, entry.active - 1)
+        entry.last_used = time.time()
+        if entry.orphan and entry.active == 0:
+            self._evict(entry)
+            self._save()
+            return
+        self._spawn(self._refresh(key))
+
+    def discard(self, path: Path) -> bool:
+        """无法直接删除的工作区改名移入回收目录后台删除，原路径可立即复用"""
+        entry = self._entries.pop(path.name, None)
+        try:
+            self.trash_dir.mkdir(parents=True, exist_ok=True)
+            target = self.trash_dir / f"{path.name}_{uuid.uuid4().hex[:8]}"
+            os.replace(path, target)
+        except OSError as e:
+            logger.warning(f"移动工作区到回收目录失败: {path}, 错误: {e}")
+            if entry is not None:
+                self._entries[path.name] = entry
+            return False
+        self._spawn(self._delete(target, entry.size if entry else 0))
+        return True
+
+    async def _refresh(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.size = await asyncio.to_thread(self._measure, self.root / key)
+        self._save()
+        await self.enforce()
+
+    def schedule_enforce(self):
+        self._spawn(self.enforce())
+
+    async def enforce(self):
+        """总占用超过配额时，按最近使用时间从旧到新淘汰空闲工作区，直到降到低水位"""
+        if self.quota_bytes <= 0 or self._enforce_lock is None:
+            return
+        async with self._enforce_lock:
+            total = self.total_bytes
+            if total <= self.quota_bytes:
+                return
+            target = int(self.quota_bytes * self.LOW_WATERMARK)
+            now = time.time()
+            candidates = sorted(
+                (
+                    entry for entry in self._entries.values()
+                    if entry.active == 0
+                    and (entry.orphan or now - entry.last_used >= self.min_idle_seconds)
+                    and not (self.lease_manager is not None and self.lease_manager.is_busy(entry.key))
+                ),
+                key=lambda entry: (not entry.orphan, entry.last_used),
+            )
+            for entry in candidates:
+                if total <= target:
+                    break
+                logger.info(
+                    f"工作区超出配额，淘汰: key={entry.key}, size={entry.size}, "
+                    f"空闲 {now - entry.last_used:.0f}s, 命中率 {entry.hit_rate:.2f}"
+                )
+                if self._evict(entry):
+                    total -= entry.size
+            if total > self.quota_bytes:
+                logger.warning(f"工作区占用仍超出配额: {total} > {self.quota_bytes}，其余工作区正在使用或刚使用过")
+            self._save()
+
+    def _evict(self, entry: PoolEntry) -> bool:
+        path = self.root / entry.key
+        if not path.exists():
+            self._entries.pop(entry.key, None)
+            return True
+        if not self.discard(path):
+            return False
+        self.evictions += 1
+        return True
+
+    async def _delete(self, path: Path, size: int):
+        self.pending_deletions += 1
+        try:
+            await asyncio.to_thread(shutil.rmtree, path, True)
+            if path.exists():
+                self.failed_deletions += 1
+                logger.warning(f"后台删除工作区未完成: {path}")
+            else:
+                self.bytes_evicted += size
+        finally:
+            self.pending_deletions -= 1
+
+    def close(self):
+        for task in list(self._background):
+            task.cancel()
+        self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = sum(entry.hits for entry in self._entries.values())
+        misses = sum(entry.misses for entry in self._entries.values())
+        return {
+            "root": str(self.root),
+            "workspaces": len(self._entries),
+            "total_bytes": self.total_bytes,
+            "quota_bytes": self.quota_bytes,
+            "usage_ratio": round(self.total_bytes / self.quota_bytes, 3) if self.quota_bytes else None,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "evictions": self.evictions,
+            "bytes_evicted": self.bytes_evicted,
+            "pending_deletions": self.pending_deletions,
+            "failed_deletions": self.failed_deletions,
+            "entries": sorted(
+                (entry.to_dict() for entry in self._entries.values()),
+                key=lambda item: item["last_used"],
+                reverse=True,
+            ),
+        }
@@ -16,6 +16,8 @@ from app.core.exceptions import (
 )
 from app.api.v1.router import api_router
 from app.services.git_service import GitService
+from app.services.github_client import github_client
+from app.services.task_store import task_store
 
 
 logger = setup_logging()
@@ -30,11 +32,16 @@ async def lifespan(app: FastAPI):
     
     GitService.initialize()
     logger.info("GitService 自动清理和监控任务已启动")
+    await github_client.start()
+    await task_store.start()
+    await GitService.recover_tasks()
     
     yield
     
     logger.info("Shutting down gracefully...")
     GitService.shutdown()
+    await task_store.close()
+    await github_client.close()
     
     for task_id, task in list(GitService.process_registry.items()):
         if task.status == "running" and task.process:
@@ -0,0 +1,144 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app.services.ignore_matcher import IgnoreMatcher, compile_pattern
+
+
+RULES = [
+    "*.log",
+    "!keep.log",
+    "/root.txt",
+    "doc/*.txt",
+    "**/cache",
+    "a/**/b.txt",
+    "out/**",
+    "logs/",
+    "trail.txt   ",
+    "sp\\ ",
+    "\\#hash",
+    "tmp",
+]
+
+# (路径, 是否目录, 是否被忽略)，与 git check-ignore 的结果一致
+CASES = [
+    ("x.log", False, True),
+    ("keep.log", False, False),
+    ("sub/keep.log", False, False),
+    ("root.txt", False, True),
+    ("sub/root.txt", False, False),
+    ("doc/a.txt", False, True),
+    ("doc/sub/a.txt", False, False),
+    ("x/doc/a.txt", False, False),
+    ("cache/f", False, True),
+    ("y/cache/f", False, True),
+    ("a/b.txt", False, True),
+    ("a/x/y/b.txt", False, True),
+    ("out/z/f", False, True),
+    ("out", True, False),
+    ("logs/f", False, True),
+    ("z/logs/f", False, True),
+    ("w/logs", False, False),
+    ("trail.txt", False, True),
+    ("sp ", False, True),
+    ("sp", False, False),
+    ("#hash", False, True),
+    ("hash", False, False),
+    ("w/tmp", False, True),
+]
+
+
+@pytest.fixture
+def matcher() -> IgnoreMatcher:
+    return IgnoreMatcher.from_patterns(RULES)
+
+
+@pytest.mark.parametrize("path, is_dir, expected", CASES)
+def test_matches_gitignore_semantics(matcher, path, is_dir, expected):
+    assert matcher.is_ignored(path, is_dir=is_dir) is expected
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="需要 git")
+def test_agrees_with_git_check_ignore(tmp_path: Path, matcher):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / ".gitignore").write_text("\n".join(RULES) + "\n", encoding="utf-8")
+    for path, is_dir, _ in CASES:
+        target = tmp_path / path
+        if is_dir:
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.touch()
+
+    for path, is_dir, _ in CASES:
+        result = subprocess.run(["git", "check-ignore", "-q", path], cwd=tmp_path)
+        assert matcher.is_ignored(path, is_dir=is_dir) is (result.returncode == 0), path
+
+
+def test_negation_uses_last_matching_rule():
+    matcher = IgnoreMatcher.from_patterns(["*.txt", "!important.txt", "important.txt"])
+    assert matcher.is_ignored("important.txt")
+    matcher = IgnoreMatcher.from_patterns(["*.txt", "!important.txt"])
+    assert not matcher.is_ignored("important.txt")
+    assert matcher.is_ignored("other.txt")
+
+
+def test_negation_cannot_reinclude_file_under_ignored_directory():
+    matcher = IgnoreMatcher.from_patterns(["build/", "!build/keep.txt"])
+    assert matcher.is_ignored("build", is_dir=True)
+    assert matcher.is_ignored("build/keep.txt")
+
+
+def test_directory_only_rule_ignores_directories_but_not_files():
+    matcher = IgnoreMatcher.from_patterns(["node_modules/"])
+    assert matcher.is_ignored("node_modules", is_dir=True)
+    assert matcher.is_ignored("pkg/node_modules", is_dir=True)
+    assert matcher.is_ignored("pkg/node_modules/x/index.js")
+    assert not matcher.is_ignored("node_modules")
+
+
+def test_anchored_rules_match_from_root_only():
+    matcher = IgnoreMatcher.from_patterns(["/dist", "src/gen/"])
+    assert matcher.is_ignored("dist", is_dir=True)
+    assert not matcher.is_ignored("lib/dist", is_dir=True)
+    assert matcher.is_ignored("src/gen", is_dir=True)
+    assert not matcher.is_ignored("lib/src/gen", is_dir=True)
+
+
+def test_double_star_forms():
+    matcher = IgnoreMatcher.from_patterns(["**/foo", "a/**/b", "abc/**"])
+    for path in ("foo", "x/foo", "x/y/foo"):
+        assert matcher.is_ignored(path)
+    for path in ("a/b", "a/x/b", "a/x/y/b"):
+        assert matcher.is_ignored(path)
+    assert matcher.is_ignored("abc/x")
+    assert matcher.is_ignored("abc/x/y")
+    assert not matcher.is_ignored("abc", is_dir=True)
+    assert not matcher.is_ignored("xabc/x")
+
+
+def test_trailing_spaces_are_stripped_unless_escaped():
+    assert compile_pattern("name.txt  ")[4] == "name.txt"
+    assert compile_pattern("name\\ ")[4] == "name\\ "
+    assert compile_pattern("   ") is None
+    assert compile_pattern("# comment") is None
+
+
+def test_later_layers_take_precedence():
+    matcher = IgnoreMatcher()
+    matcher.add_patterns(["*.txt"])
+    matcher.add_patterns(["!a.txt"])
+    assert not matcher.is_ignored("a.txt")
+    assert matcher.is_ignored("b.txt")
+
+
+def test_layer_prefix_and_base():
+    matcher = IgnoreMatcher()
+    matcher.add_patterns(["/proj/secret.txt"], prefix="proj")
+    matcher.add_patterns(["*.tmp"], base="sub")
+    assert matcher.is_ignored("secret.txt")
+    assert not matcher.is_ignored("other/secret.txt")
+    assert matcher.is_ignored("sub/x.tmp")
+    assert not matcher.is_ignored("x.tmp")
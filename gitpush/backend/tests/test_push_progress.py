@@ -0,0 +1,58 @@
+from app.services.push_progress import STALL_THRESHOLD_SECONDS, PushProgress
+
+
+def test_parses_writing_objects_with_size_and_rate():
+    progress = PushProgress()
+    assert progress.feed("Writing objects:  40% (4/10), 2.00 MiB | 1.00 MiB/s")
+    assert progress.phase == "writing objects"
+    assert progress.percent == 40
+    assert (progress.objects_done, progress.objects_total) == (4, 10)
+    assert progress.bytes_sent == 2 * 1024 ** 2
+    assert progress.transfer_rate == 1024 ** 2
+    assert progress.estimate_eta() == 3.0
+
+
+def test_parses_remote_prefix_and_count_only_lines():
+    progress = PushProgress()
+    assert progress.feed("remote: Counting objects: 12, done.")
+    assert progress.phase == "counting objects"
+    assert progress.objects_done == 12
+    assert progress.objects_total is None
+    assert progress.percent == 100
+    assert progress.phase_done
+    assert progress.estimate_eta() == 0.0
+
+
+def test_ignores_unrelated_lines():
+    progress = PushProgress()
+    assert not progress.feed("To github.com:o/r.git")
+    assert not progress.feed("   abc123..def456  main -> main")
+    assert progress.phase is None
+    assert progress.estimate_eta() is None
+
+
+def test_new_phase_resets_transfer_figures():
+    progress = PushProgress()
+    progress.feed("Writing objects: 100% (10/10), 5.00 KiB | 5.00 KiB/s, done.")
+    progress.feed("Resolving deltas:  50% (1/2)")
+    assert progress.phase == "resolving deltas"
+    assert progress.bytes_sent is None
+    assert progress.transfer_rate is None
+    assert not progress.phase_done
+
+
+def test_eta_from_elapsed_time_without_rate():
+    progress = PushProgress()
+    progress.feed("Compressing objects:  25% (1/4)")
+    progress.phase_started_at = 100.0
+    assert progress.estimate_eta(now=110.0) == 30.0
+
+
+def test_stall_detection():
+    progress = PushProgress()
+    progress.feed("Writing objects:  10% (1/10)")
+    progress.updated_at = 0.0
+    assert progress.is_stalled(now=STALL_THRESHOLD_SECONDS + 1)
+    assert not progress.is_stalled(now=STALL_THRESHOLD_SECONDS - 1)
+    progress.feed("Writing objects: 100% (10/10), done.")
+    assert not progress.is_stalled(now=1e12)
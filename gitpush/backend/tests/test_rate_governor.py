@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from app.core.exceptions import AppException, ErrorCode
+from app.services.rate_governor import SECONDARY_LIMIT_BACKOFF, RateGovernor, TokenBudget
+
+
+def headers(**values) -> CIMultiDictProxy:
+    return CIMultiDictProxy(CIMultiDict({name: str(value) for name, value in values.items()}))
+
+
+def test_budget_reads_rate_limit_headers():
+    budget = TokenBudget(burst=5, default_rate=10.0)
+    reset = time.time() + 100
+    budget.update(headers(**{"X-RateLimit-Limit": 5000, "X-RateLimit-Remaining": 4000, "X-RateLimit-Reset": reset}))
+    assert (budget.limit, budget.remaining, budget.reset_at) == (5000, 4000, reset)
+    assert budget.refill_rate == 10.0
+
+
+def test_budget_paces_when_remaining_is_low():
+    budget = TokenBudget(burst=5, default_rate=10.0)
+    budget.limit = 5000
+    budget.remaining = 100
+    budget.reset_at = time.time() + 200
+    assert budget.refill_rate == pytest.approx(0.5, rel=0.05)
+
+
+def test_reserve_blocks_until_reset():
+    budget = TokenBudget(burst=5, default_rate=10.0)
+    budget.limit = 5000
+    budget.remaining = 10
+    budget.reset_at = time.time() + 30
+    assert budget.next_delay(reserve=50) == pytest.approx(31.0, abs=0.5)
+    assert budget.next_delay(reserve=0) == 0.0
+
+
+def test_observe_uses_retry_after_and_secondary_limit_message():
+    governor = RateGovernor(burst=5, default_rate=10.0, reserve=0, max_wait=60)
+    assert governor.observe("tok", 200, headers()) is None
+    assert governor.observe("tok", 403, headers(**{"Retry-After": 7})) == 7.0
+    assert governor.observe("tok", 403, headers(), "You have exceeded a secondary rate limit") == SECONDARY_LIMIT_BACKOFF
+    assert governor.observe("tok", 403, headers(), "Resource not accessible by integration") is None
+    assert governor.get_budget("tok")["rate_limited"] == 2
+
+
+def test_acquire_consumes_burst_then_waits():
+    async def scenario():
+        governor = RateGovernor(burst=2, default_rate=20.0, reserve=0, max_wait=5)
+        started = time.monotonic()
+        for _ in range(3):
+            await governor.acquire("tok")
+        return time.monotonic() - started, governor.get_budget("tok")
+
+    elapsed, budget = asyncio.run(scenario())
+    assert elapsed >= 0.04
+    assert budget["requests"] == 3
+    assert budget["throttled"] >= 1
+
+
+def test_acquire_counts_queueing_time_against_max_wait():
+    async def scenario():
+        governor = RateGovernor(burst=1, default_rate=2.0, reserve=0, max_wait=1.2)
+
+        async def one():
+            try:
+                await governor.acquire("tok")
+                return "ok"
+            except AppException as e:
+                assert e.code == ErrorCode.RATE_LIMIT_ERROR
+                return "limited"
+
+        started = time.monotonic()
+        results = await asyncio.gather(*(one() for _ in range(6)))
+        return results, time.monotonic() - started, governor
+
+    results, elapsed, governor = asyncio.run(scenario())
+    assert results.count("ok") == 3
+    assert results.count("limited") == 3
+    assert elapsed < 2.0
+    assert governor.get_stats()["waiting"] == 0
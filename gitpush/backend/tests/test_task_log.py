@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from app.services.task_log import TaskLog
+
+
+def test_ring_buffer_drops_oldest_lines_without_spill():
+    log = TaskLog("t", max_lines=3)
+    for i in range(5):
+        assert log.append("stdout", f"line{i}") == i
+
+    assert log.total_lines == 5
+    assert log.first_offset == 2
+    assert [entry[2] for entry in log.read(0, 10)] == ["line2", "line3", "line4"]
+    assert log.get_stats()["dropped_lines"] == 2
+
+
+def test_byte_limit_evicts_lines():
+    log = TaskLog("t", max_lines=100, max_bytes=10)
+    log.append("stdout", "aaaaaa")
+    log.append("stdout", "bbbbbb")
+    assert log.memory_bytes <= 10
+    assert [entry[2] for entry in log.read(0, 10)] == ["bbbbbb"]
+
+
+def test_spilled_lines_are_readable_by_offset(tmp_path: Path):
+    log = TaskLog("t", max_lines=2, spill_dir=tmp_path)
+    for i in range(TaskLog.SPILL_INDEX_STRIDE * 2 + 10):
+        log.append("stderr" if i % 2 else "stdout", f"line{i}")
+
+    entries = log.read(0, 10000)
+    assert [entry[0] for entry in entries] == list(range(log.total_lines))
+    assert entries[3][1] == "stderr"
+
+    middle = log.read(TaskLog.SPILL_INDEX_STRIDE + 5, 3)
+    assert [entry[2] for entry in middle] == [f"line{TaskLog.SPILL_INDEX_STRIDE + i}" for i in range(5, 8)]
+
+
+def test_spill_survives_release_and_close_deletes_file(tmp_path: Path):
+    log = TaskLog("t", max_lines=1, spill_dir=tmp_path)
+    for i in range(5):
+        log.append("stdout", f"a{i}")
+    log.release()
+    for i in range(5, 8):
+        log.append("stdout", f"a{i}")
+
+    assert [entry[2] for entry in log.read(0, 100)] == [f"a{i}" for i in range(8)]
+    spill_path = log.spill_path
+    assert spill_path.exists()
+    log.close()
+    assert not spill_path.exists()
+
+
+def test_reused_task_id_truncates_previous_spill_file(tmp_path: Path):
+    (tmp_path / "t.log").write_bytes(b"stdout\t0.000\tstale\n" * 10)
+    log = TaskLog("t", max_lines=1, spill_dir=tmp_path)
+    for i in range(4):
+        log.append("stdout", f"new{i}")
+
+    assert [entry[2] for entry in log.read(0, 100)] == [f"new{i}" for i in range(4)]
+
+
+def test_tail_filters_by_stream():
+    log = TaskLog("t")
+    log.append("stdout", "out1")
+    log.append("stderr", "err1")
+    log.append("stdout", "out2")
+    assert log.tail(2) == ["err1", "out2"]
+    assert log.tail(5, stream="stdout") == ["out1", "out2"]
+    assert log.tail_text(1) == "out2\n"
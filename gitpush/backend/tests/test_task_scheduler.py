@@ -0,0 +1,174 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.task_scheduler import TaskScheduler
+
+
+class FakeTask:
+    def __init__(self, task_id: str, target: str, priority: int = 0):
+        self.task_id = task_id
+        self.target = target
+        self.priority = priority
+        self.status = "pending"
+        self.queued_at: Optional[float] = None
+        self.wait_time = 0.0
+
+
+class Recorder:
+    """记录每次调用 runner 的 (任务, 跟随任务)，任务在 release() 之前保持运行"""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, List[str]]] = []
+        self.gates: Dict[str, asyncio.Event] = {}
+
+    async def __call__(self, task: Any, followers: Optional[List[Any]] = None):
+        self.calls.append((task.task_id, [f.task_id for f in followers or []]))
+        for member in [task] + list(followers or []):
+            member.status = "running"
+        gate = self.gates.setdefault(task.task_id, asyncio.Event())
+        await gate.wait()
+        for member in [task] + list(followers or []):
+            member.status = "done"
+
+    def started(self) -> List[str]:
+        return [task_id for task_id, _ in self.calls]
+
+    async def release(self, task_id: str):
+        self.gates.setdefault(task_id, asyncio.Event()).set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_conflicting_task_is_deferred_until_key_is_released():
+    async def scenario():
+        recorder = Recorder()
+        scheduler = TaskScheduler(recorder, max_concurrent=2, conflict_key=lambda t: t.target)
+        scheduler.submit(FakeTask("a", "repo1"))
+        scheduler.submit(FakeTask("b", "repo1"))
+        scheduler.submit(FakeTask("c", "repo2"))
+        await settle()
+
+        assert recorder.started() == ["a", "c"]
+        assert scheduler.queue_depth == 1
+        assert scheduler.total_deferred >= 1
+
+        await recorder.release("c")
+        assert recorder.started() == ["a", "c"]
+
+        await recorder.release("a")
+        assert recorder.started() == ["a", "c", "b"]
+        await recorder.release("b")
+        assert scheduler.running_count == 0
+
+    asyncio.run(scenario())
+
+
+def test_deferred_task_keeps_its_priority_position():
+    async def scenario():
+        recorder = Recorder()
+        scheduler = TaskScheduler(recorder, max_concurrent=1, conflict_key=lambda t: t.target)
+        scheduler.submit(FakeTask("a", "repo1"))
+        scheduler.submit(FakeTask("low", "repo2", priority=0))
+        scheduler.submit(FakeTask("high", "repo1", priority=5))
+        await settle()
+
+        await recorder.release("a")
+        assert recorder.started() == ["a", "high"]
+        await recorder.release("high")
+        assert recorder.started() == ["a", "high", "low"]
+        await recorder.release("low")
+
+    asyncio.run(scenario())
+
+
+def test_followers_with_same_key_are_coalesced_in_priority_order():
+    async def scenario():
+        recorder = Recorder()
+        scheduler = TaskScheduler(
+            recorder,
+            max_concurrent=1,
+            conflict_key=lambda t: t.target,
+            coalesce_key=lambda t: t.target,
+            max_batch=3
+        )
+        scheduler.submit(FakeTask("blocker", "other"))
+        scheduler.submit(FakeTask("t1", "repo"))
+        scheduler.submit(FakeTask("t2", "repo"))
+        scheduler.submit(FakeTask("u1", "elsewhere"))
+        scheduler.submit(FakeTask("t3", "repo", priority=1))
+        scheduler.submit(FakeTask("t4", "repo"))
+        await settle()
+
+        await recorder.release("blocker")
+        assert recorder.calls[1] == ("t3", ["t1", "t2"])
+        assert scheduler.total_batches == 1
+        assert scheduler.total_coalesced == 2
+
+        await recorder.release("t3")
+        assert recorder.calls[2] == ("u1", [])
+        await recorder.release("u1")
+        assert recorder.calls[3] == ("t4", [])
+        await recorder.release("t4")
+
+    asyncio.run(scenario())
+
+
+def test_no_coalescing_without_key_or_batch_size():
+    async def scenario():
+        recorder = Recorder()
+        scheduler = TaskScheduler(
+            recorder,
+            max_concurrent=1,
+            coalesce_key=lambda t: None if t.task_id == "solo" else t.target,
+            max_batch=1
+        )
+        scheduler.submit(FakeTask("blocker", "x"))
+        scheduler.submit(FakeTask("a", "repo"))
+        scheduler.submit(FakeTask("b", "repo"))
+        await settle()
+        await recorder.release("blocker")
+        assert recorder.calls[1] == ("a", [])
+        await recorder.release("a")
+        await recorder.release("b")
+
+        scheduler.max_batch = 4
+        scheduler.submit(FakeTask("blocker2", "x"))
+        scheduler.submit(FakeTask("solo", "repo"))
+        scheduler.submit(FakeTask("c", "repo"))
+        await settle()
+        await recorder.release("blocker2")
+        assert recorder.calls[-1] == ("solo", [])
+        await recorder.release("solo")
+        assert recorder.calls[-1] == ("c", [])
+        await recorder.release("c")
+
+    asyncio.run(scenario())
+
+
+def test_non_pending_tasks_are_skipped():
+    async def scenario():
+        recorder = Recorder()
+        scheduler = TaskScheduler(
+            recorder,
+            max_concurrent=1,
+            coalesce_key=lambda t: t.target,
+            max_batch=4
+        )
+        scheduler.submit(FakeTask("blocker", "x"))
+        canceled = FakeTask("canceled", "repo")
+        scheduler.submit(canceled)
+        scheduler.submit(FakeTask("a", "repo"))
+        canceled.status = "canceled"
+        await settle()
+
+        assert scheduler.get_queue_position("a") == 1
+        await recorder.release("blocker")
+        assert recorder.calls[1] == ("a", [])
+        await recorder.release("a")
+
+    asyncio.run(scenario())
@@ -405,33 +405,16 @@ export async function runPythonUpload(token, repo, branch, localPaths, proxy = '
     }
     
     const taskId = pushResult.task_id;
-    let finalStatus = null;
-    let pollCount = 0;
-    const maxPolls = 300;
+    await waitForGitTask(taskId);
     
-    while (pollCount < maxPolls) {
-      pollCount++;
-      const statusResult = await getGitStatus(taskId);
-      
-      if (!statusResult.success) {
-        return {
-          success: false,
-          message: statusResult.message || 'Failed to get Git status',
-          took: Math.round(performance.now() - startTime)
-        };
-      }
-      
-      finalStatus = statusResult;
-      
-      if (statusResult.status === 'done') {
-        break;
-      }
-      
-      if (statusResult.status === 'error' || statusResult.status === 'canceled') {
-        break;
-      }
-      
-      await new Promise(resolve => setTimeout(resolve, 500));
+    const finalStatus = await getGitStatus(taskId);
+    
+    if (!finalStatus.success) {
+      return {
+        success: false,
+        message: finalStatus.message || 'Failed to get Git status',
+        took: Math.round(performance.now() - startTime)
+      };
     }
     
     const endTime = performance.now();
@@ -598,6 +581,62 @@ export async function getGitStatus(taskId) {
   }
 }
 
+/**
+ * Wait for a Git task to finish via the server-sent event stream,
+ * falling back to polling when EventSource is unavailable or fails
+ * @param {string} taskId - Task ID from push start
+ * @param {Function} [onEvent] - Called with (type, data) for each event
+ * @returns {Promise<string|null>} Terminal status, or null if unknown
+ */
+export function waitForGitTask(taskId, onEvent) {
+  const terminal = ['done', 'error', 'canceled'];
+  
+  const poll = async () => {
+    for (let pollCount = 0; pollCount < 300; pollCount++) {
+      const statusResult = await getGitStatus(taskId);
+      if (!statusResult.success) return null;
+      if (terminal.includes(statusResult.status)) return statusResult.status;
+      await new Promise(resolve => setTimeout(resolve, 500));
+    }
+    return null;
+  };
+  
+  if (typeof EventSource === 'undefined') {
+    return poll();
+  }
+  
+  return new Promise((resolve) => {
+    const source = new EventSource(`${apiClient.defaults.baseURL}/git/events/${taskId}`);
+    let settled = false;
+    
+    const finish = (status) => {
+      if (settled) return;
+      settled = true;
+      source.close();
+      resolve(status);
+    };
+    
+    const handle = (type) => (event) => {
+      const data = JSON.parse(event.data);
+      onEvent?.(type, data);
+      if ((type === 'status' || type === 'snapshot') && terminal.includes(data.status)) {
+        finish(data.status);
+      }
+    };
+    
+    ['snapshot', 'status', 'progress', 'output'].forEach((type) => {
+      source.addEventListener(type, handle(type));
+    });
+    
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED && !settled) {
+        settled = true;
+        poll().then(resolve);
+      }
+    };
+  });
+}
+
 /**
  * Cancel Git push using FastAPI backend
  * @param {string} taskId - Task ID to cancel